@@ -65,6 +65,12 @@ class HybridDatabaseManager:
             return None
         return await self.primary_db.store_pan_data(pan_data, api_endpoint)
     
+    async def bulk_store_pan_data(self, pan_records: List[Dict[str, Any]], api_endpoint: str = None):
+        """Store many PAN records at once, e.g. for a backfill"""
+        if not self.initialized:
+            return [None] * len(pan_records)
+        return await self.primary_db.bulk_store_pan_data(pan_records, api_endpoint)
+    
     async def search_by_pan(self, pan_number: str):
         """Search by PAN number"""
         if not self.initialized:
@@ -118,6 +124,10 @@ class MockDatabaseManager:
         logger.warning("Mock database: PAN data not stored (Google Sheets disabled)")
         return None
     
+    async def bulk_store_pan_data(self, pan_records: List[Dict[str, Any]], api_endpoint: str = None):
+        logger.warning("Mock database: PAN data not stored (Google Sheets disabled)")
+        return [None] * len(pan_records)
+    
     async def search_by_pan(self, pan_number: str):
         logger.warning("Mock database: Search not available (Google Sheets disabled)")
         return None
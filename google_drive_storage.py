@@ -31,6 +31,7 @@ class GoogleDriveKYCStorage:
     
     def __init__(self):
         self.drive_service = None
+        self.service_account_email = None
         self.initialized = False
         self.executor = ThreadPoolExecutor(max_workers=5)
         
@@ -48,6 +49,13 @@ class GoogleDriveKYCStorage:
         
         self.folder_ids = {}
         self.file_cache = {}  # Cache for file metadata to prevent duplicates
+        
+        # Resolved folder IDs persisted across restarts to skip Drive folder searches
+        self.folder_cache_path = os.path.expanduser(
+            os.getenv("KYC_DRIVE_FOLDER_CACHE", "~/.kyc_cache.json")
+        )
+        self.folder_id_cache = self._load_folder_id_cache()
+        self._folder_cache_dirty = False  # folder_id_cache changed since it was last written
         self.duplicate_strategy = 'version'  # 'skip', 'replace', 'version'
         
         # Performance tracking
@@ -100,6 +108,7 @@ class GoogleDriveKYCStorage:
             
             # Initialize credentials
             creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
+            self.service_account_email = creds.service_account_email
             
             # Initialize Google Drive service with retry configuration
             self.drive_service = build(
@@ -177,38 +186,7 @@ class GoogleDriveKYCStorage:
         try:
             logger.info("📁 Initializing complete folder structure...")
             
-            # Determine root folder
-            if self.parent_folder_id:
-                root_folder_id = await self._verify_and_get_parent_folder()
-            else:
-                root_folder_id = await self._create_or_find_folder(self.root_folder_name)
-            
-            self.folder_ids['root'] = root_folder_id
-            
-            # Create main folders and subfolders
-            for folder_key, folder_config in self.folder_structure.items():
-                folder_name = folder_config['name']
-                folder_description = folder_config.get('description', '')
-                
-                # Create main folder
-                main_folder_id = await self._create_or_find_folder(
-                    folder_name, 
-                    root_folder_id, 
-                    folder_description
-                )
-                self.folder_ids[folder_key] = main_folder_id
-                
-                # Create subfolders
-                subfolders = folder_config.get('subfolders', {})
-                for subfolder_key, subfolder_name in subfolders.items():
-                    subfolder_id = await self._create_or_find_folder(
-                        subfolder_name, 
-                        main_folder_id,
-                        f"Subfolder for {folder_description}"
-                    )
-                    self.folder_ids[f"{folder_key}_{subfolder_key}"] = subfolder_id
-                
-                logger.info(f"✅ {folder_name}: {len(subfolders)} subfolders")
+            await self._resolve_folder_structure()
             
             # Verify folder structure
             await self._verify_folder_structure()
@@ -217,6 +195,43 @@ class GoogleDriveKYCStorage:
             logger.error(f"Error initializing folder structure: {str(e)}")
             raise
     
+    async def _resolve_folder_structure(self):
+        """Find or create every folder in the structure and record its ID in folder_ids"""
+        # Determine root folder
+        if self.parent_folder_id:
+            root_folder_id = await self._verify_and_get_parent_folder()
+        else:
+            root_folder_id = await self._create_or_find_folder(self.root_folder_name)
+        
+        self.folder_ids['root'] = root_folder_id
+        
+        # Create main folders and subfolders
+        for folder_key, folder_config in self.folder_structure.items():
+            folder_name = folder_config['name']
+            folder_description = folder_config.get('description', '')
+            
+            # Create main folder
+            main_folder_id = await self._create_or_find_folder(
+                folder_name, 
+                root_folder_id, 
+                folder_description
+            )
+            self.folder_ids[folder_key] = main_folder_id
+            
+            # Create subfolders
+            subfolders = folder_config.get('subfolders', {})
+            for subfolder_key, subfolder_name in subfolders.items():
+                subfolder_id = await self._create_or_find_folder(
+                    subfolder_name, 
+                    main_folder_id,
+                    f"Subfolder for {folder_description}"
+                )
+                self.folder_ids[f"{folder_key}_{subfolder_key}"] = subfolder_id
+            
+            logger.info(f"✅ {folder_name}: {len(subfolders)} subfolders")
+        
+        await self._flush_folder_id_cache()
+    
     async def _verify_and_get_parent_folder(self) -> str:
         """Verify parent folder exists and has proper permissions"""
         try:
@@ -287,6 +302,7 @@ class GoogleDriveKYCStorage:
             
             # Verify folder was created correctly
             await self._verify_folder_creation(folder_id, parent_id)
+            self._remember_folder(folder_name, parent_id, folder_id)
             
             self.operation_stats['folders_created'] += 1
             logger.info(f"✅ Created folder: {folder_name} (ID: {folder_id})")
@@ -297,8 +313,55 @@ class GoogleDriveKYCStorage:
             logger.error(f"Error creating folder {folder_name}: {str(e)}")
             raise
     
+    def _folder_cache_key(self, folder_name: str, parent_id: str = None) -> str:
+        """Cache key for a folder name under a parent, as seen by the current service account"""
+        return f"{self.service_account_email}:{parent_id or 'root'}/{folder_name}"
+    
+    def _load_folder_id_cache(self) -> Dict[str, str]:
+        """Load persisted folder IDs from the local cache file"""
+        try:
+            with open(self.folder_cache_path, 'r') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+    
+    def _save_folder_id_cache(self, cache: Dict[str, str]):
+        """Persist resolved folder IDs to the local cache file"""
+        try:
+            with open(self.folder_cache_path, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.warning(f"Could not persist folder cache: {e}")
+    
+    async def _flush_folder_id_cache(self):
+        """Write the folder cache file once, off the event loop, if anything changed"""
+        if self._folder_cache_dirty:
+            self._folder_cache_dirty = False
+            await self._run_sync(self._save_folder_id_cache, dict(self.folder_id_cache))
+    
+    def _remember_folder(self, folder_name: str, parent_id: str, folder_id: str):
+        """Record a resolved folder ID in the persistent cache"""
+        key = self._folder_cache_key(folder_name, parent_id)
+        if self.folder_id_cache.get(key) != folder_id:
+            self.folder_id_cache[key] = folder_id
+            self._folder_cache_dirty = True
+    
+    def _forget_folder_ids(self, folder_ids: Set[str]):
+        """Drop stale folder IDs so the next lookup searches Drive again"""
+        stale_keys = [key for key, value in self.folder_id_cache.items() if value in folder_ids]
+        if stale_keys:
+            for key in stale_keys:
+                del self.folder_id_cache[key]
+            self._folder_cache_dirty = True
+    
     async def _find_existing_folder(self, folder_name: str, parent_id: str = None) -> Optional[str]:
         """Find existing folder with exact name match"""
+        # Cached IDs are trusted here; only _verify_folder_structure, run at initialization, checks them against Drive
+        cached_id = self.folder_id_cache.get(self._folder_cache_key(folder_name, parent_id))
+        if cached_id:
+            return cached_id
+        
         try:
             if parent_id:
                 query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and '{parent_id}' in parents and trashed=false"
@@ -315,6 +378,7 @@ class GoogleDriveKYCStorage:
             folders = await self._run_sync(search_folders)
             
             if folders:
+                self._remember_folder(folder_name, parent_id, folders[0]['id'])
                 return folders[0]['id']
             
             return None
@@ -358,18 +422,23 @@ class GoogleDriveKYCStorage:
                     def check_folder():
                         return self.drive_service.files().get(
                             fileId=folder_id,
-                            fields='id,name,mimeType'
+                            fields='id,name,mimeType,trashed'
                         ).execute()
                     
                     folder_info = await self._run_sync(check_folder)
-                    if folder_info['mimeType'] != 'application/vnd.google-apps.folder':
+                    if folder_info['mimeType'] != 'application/vnd.google-apps.folder' or folder_info.get('trashed'):
                         missing_folders.append(folder_key)
                         
                 except Exception:
                     missing_folders.append(folder_key)
             
             if missing_folders:
-                logger.warning(f"⚠️ Missing or invalid folders: {missing_folders}")
+                logger.warning(f"⚠️ Missing, trashed or invalid folders: {missing_folders}")
+                self._forget_folder_ids({self.folder_ids[key] for key in missing_folders})
+                
+                # Resolve the structure again so folder_ids stops pointing at the stale folders
+                await self._resolve_folder_structure()
+                logger.info("✅ Stale folders re-resolved")
             else:
                 logger.info("✅ Folder structure verified successfully")
                 
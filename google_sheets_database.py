@@ -5,29 +5,267 @@ import logging
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
 import gspread
+from gspread.utils import a1_to_rowcol, absolute_range_name, numericise_all, rowcol_to_a1
 from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+from requests.adapters import HTTPAdapter
 from googleapiclient.http import MediaIoBaseUpload
 import io
 import os
 import asyncio
+import random
+import bisect
+import heapq
+import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
-from functools import partial
 
 from config_db import DATABASE_ENABLED
 
+# orjson is optional; JSON columns fall back to the standard library json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("kyc-google-sheets")
 
+# Header row of every worksheet, keyed like GoogleSheetsKYCDatabase.worksheets
+_WORKSHEET_HEADERS = {
+    'universal_records': [
+        'ID', 'PAN_Number', 'Aadhaar_Number', 'Voter_ID', 'Driving_License', 
+        'Passport_Number', 'GSTIN', 'TAN_Number', 'Bank_Account',
+        'Full_Name', 'First_Name', 'Middle_Name', 'Last_Name', 'Father_Name',
+        'Gender', 'DOB', 'Category', 'Is_Minor',
+        'Phone_Number', 'Email', 'Address_Data',
+        'Company_Name', 'Business_Type', 'Incorporation_Date',
+        'IFSC_Code', 'Bank_Name', 'Branch_Name', 'UPI_ID',
+        'Aadhaar_Linked', 'DOB_Verified', 'Verification_Status',
+        'Last_Verification_Type', 'Verification_Source', 'Verification_Count',
+        'Confidence_Score', 'Verification_History', 'Raw_Responses',
+        'Extra_Data', 'Created_At', 'Updated_At', 'Last_Verified_At'
+    ],
+    # PAN Records worksheet (legacy compatibility)
+    'pan_records': [
+        'ID', 'PAN_Number', 'Full_Name', 'First_Name', 'Middle_Name', 'Last_Name',
+        'Father_Name', 'Email', 'Phone_Number', 'Gender', 'DOB', 'Category',
+        'Is_Minor', 'Address_Data', 'Masked_Aadhaar', 'Aadhaar_Linked',
+        'DOB_Verified', 'Less_Info', 'Raw_API_Data', 'API_Endpoint',
+        'Verification_Count', 'Created_At', 'Updated_At', 'Last_Verified_At'
+    ],
+    'search_history': [
+        'ID', 'Search_Type', 'Search_Query', 'Results_Count', 'Search_Timestamp'
+    ],
+    'audit_log': [
+        'ID', 'Record_ID', 'Action', 'Changed_Fields', 'Old_Values', 
+        'New_Values', 'Timestamp'
+    ]
+}
+
+# (sheet column, output key) pairs produced by _convert_sheet_record_to_dict, in output order
+_RECORD_FIELD_MAP = (
+    ('ID', 'id'), ('PAN_Number', 'pan_number'), ('Full_Name', 'full_name'),
+    ('First_Name', 'first_name'), ('Middle_Name', 'middle_name'), ('Last_Name', 'last_name'),
+    ('Father_Name', 'father_name'), ('Email', 'email'), ('Phone_Number', 'phone_number'),
+    ('Gender', 'gender'), ('DOB', 'dob'), ('Category', 'category'), ('Is_Minor', 'is_minor'),
+    ('Address_Data', 'address_data'), ('Masked_Aadhaar', 'masked_aadhaar'),
+    ('Aadhaar_Linked', 'aadhaar_linked'), ('DOB_Verified', 'dob_verified'),
+    ('Less_Info', 'less_info'), ('Raw_API_Data', 'raw_api_data'), ('API_Endpoint', 'api_endpoint'),
+    ('Verification_Count', 'verification_count'), ('Created_At', 'created_at'),
+    ('Updated_At', 'updated_at'), ('Last_Verified_At', 'last_verified_at')
+)
+
+# Columns holding JSON text, decoded after the plain copy
+_RECORD_JSON_FIELDS = (('Address_Data', 'address_data'), ('Raw_API_Data', 'raw_api_data'))
+
+# PAN_Records column positions, for reading mirrored raw rows
+_PAN_HEADERS = _WORKSHEET_HEADERS['pan_records']
+_PAN_WIDTH = len(_PAN_HEADERS)
+_PAN_COLUMNS = {column: index for index, column in enumerate(_PAN_HEADERS)}
+
+# _RECORD_FIELD_MAP and _RECORD_JSON_FIELDS by PAN_Records position, for converting mirrored rows directly
+_PAN_RECORD_POSITIONS = tuple((out_key, _PAN_COLUMNS[in_key]) for in_key, out_key in _RECORD_FIELD_MAP)
+_PAN_JSON_POSITIONS = tuple((out_key, _PAN_COLUMNS[in_key]) for in_key, out_key in _RECORD_JSON_FIELDS)
+
+# pan_data keys written by store_pan_data: PAN_Number..Is_Minor, then Masked_Aadhaar..Less_Info
+_PAN_IDENTITY_FIELDS = (
+    'pan_number', 'full_name', 'first_name', 'middle_name', 'last_name', 'father_name',
+    'email', 'phone_number', 'gender', 'dob', 'category', 'is_minor'
+)
+_PAN_AADHAAR_FIELDS = ('masked_aadhaar', 'aadhaar_linked', 'dob_verified', 'less_info')
+
+_DRIVE_FILES_URL = 'https://www.googleapis.com/drive/v3/files'
+
+# Worker threads for blocking gspread calls, shared by every database instance
+_SHEETS_WORKERS = int(os.getenv("KYC_SHEETS_WORKERS", "8"))
+_SHEETS_EXECUTOR = ThreadPoolExecutor(max_workers=_SHEETS_WORKERS, thread_name_prefix="gsheets")
+
+# Next free ID per (spreadsheet id, worksheet name), shared by every database instance writing the same sheet
+_next_ids: Dict[Tuple[str, str], int] = {}
+_next_id_lock = asyncio.Lock()
+
+# Google API responses retried by _run_sync, with capped exponential backoff
+_RETRY_STATUS_CODES = {429, 500, 503}
+_WRITE_RETRY_STATUS_CODES = {429}  # a 5xx may still have applied a non-idempotent write, such as an append
+_MAX_RETRIES = 5
+_RETRY_MAX_DELAY = 32  # seconds
+
+# Keep-alive connections held by the gspread session, enough for every executor thread
+_HTTP_POOL_SIZE = max(20, _SHEETS_WORKERS)
+
+# Log rows (search history, audit log) are buffered and appended in batches per worksheet
+_WRITE_QUEUE_SIZE = 200
+_WRITE_BATCH_SIZE = 100
+_WRITE_FLUSH_INTERVAL = 2.0  # seconds
+
+# Name columns matched by search_by_name, packed per row into one lowercased string for searching
+_NAME_FIELDS = ('Full_Name', 'First_Name', 'Last_Name')
+_NAME_FIELD_SEPARATOR = '\x00'
+_NAME_SEGMENT_SEPARATOR = '\x01'
+
+# In-memory copies of full worksheets are refreshed after this long
+_RECORDS_CACHE_TTL = 30  # seconds
+
+# Rows located or written by this process are remembered for direct re-reads
+_ROW_INDEX_MAX_SIZE = 10000
+_ROW_INDEX_TTL = 3600  # seconds
+
+def _header_range(headers: List[str]) -> str:
+    """Exact A1 range of a worksheet header row (e.g. A1:N1 for 14 columns)"""
+    return f"A1:{rowcol_to_a1(1, len(headers))}"
+
+def _appended_row_number(response: Dict[str, Any]) -> Optional[int]:
+    """Row number of the first row written by a values.append response"""
+    try:
+        updated_range = response['updates']['updatedRange']
+        return a1_to_rowcol(updated_range.split('!')[-1].split(':')[0])[0]
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+
+def _cell_text(value: Any) -> str:
+    """Sheet cell text for a value; strings pass through without a str() copy"""
+    if value.__class__ is str:
+        return value
+    return '' if value is None else str(value)
+
+def _sheet_text(value: Any) -> str:
+    """Formatted text Sheets reads back for a value written with valueInputOption=RAW"""
+    if value.__class__ is str:
+        return value
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return '' if value is None else str(value)
+
+def _cell_data(value: Any) -> Dict[str, Any]:
+    """CellData for an appendCells request, storing values as-is like valueInputOption=RAW"""
+    if isinstance(value, bool):
+        return {'userEnteredValue': {'boolValue': value}}
+    if isinstance(value, (int, float)):
+        return {'userEnteredValue': {'numberValue': value}}
+    return {'userEnteredValue': {'stringValue': _cell_text(value)}}
+
+def _row_cells(rows: List[List[Any]]) -> List[Dict[str, Any]]:
+    """RowData list for appendCells/updateCells requests"""
+    return [{'values': [_cell_data(value) for value in row]} for row in rows]
+
+def _pan_row(pan_data: Dict[str, Any], api_endpoint: Optional[str], row_id: int,
+             existing_record: Optional[Dict[str, Any]], timestamp: str) -> List[Any]:
+    """PAN_Records row for pan_data; serializes the JSON columns, so run it off the event loop"""
+    get = pan_data.get
+    address = get('address')
+    return [
+        row_id,
+        *[get(field, '') for field in _PAN_IDENTITY_FIELDS],
+        _json_dumps(address) if address else "",
+        *[get(field, '') for field in _PAN_AADHAAR_FIELDS],
+        _json_dumps(pan_data),
+        api_endpoint or '',
+        int(existing_record.get('Verification_Count') or 0) + 1 if existing_record else 1,
+        existing_record.get('Created_At', '') if existing_record else timestamp,
+        timestamp,
+        timestamp
+    ]
+
+def _row_to_record(headers: List[str], row: List[Any]) -> Dict[str, Any]:
+    """Build a get_all_records()-style dict from a single row of values"""
+    padded = list(row) + [''] * (len(headers) - len(row))
+    return dict(zip(headers, numericise_all(padded[:len(headers)])))
+
+def _json_loads(text: str) -> Any:
+    """Parse a JSON sheet cell, using orjson when available; both raise json.JSONDecodeError"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _json_field(value: Any) -> Any:
+    """Output value of a JSON column: None when empty, the decoded value, or the cell as-is if it is not JSON"""
+    if not value:
+        return None
+    if not isinstance(value, str):
+        return value
+    try:
+        return _json_loads(value)
+    except json.JSONDecodeError:
+        return value
+
+# Last formatted UTC timestamp, shared by writes landing in the same second
+_utc_timestamp_cache = [0, '']
+
+def _utc_timestamp() -> str:
+    """Second-resolution UTC ISO timestamp, reformatted at most once per second"""
+    now = int(time.time())
+    if _utc_timestamp_cache[0] != now:
+        _utc_timestamp_cache[1] = datetime.utcfromtimestamp(now).isoformat()
+        _utc_timestamp_cache[0] = now
+    return _utc_timestamp_cache[1]
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a value for a JSON sheet column, using orjson when available"""
+    # orjson also encodes datetimes, dataclasses, numpy values and non-string keys that json.dumps rejects
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass
+    return json.dumps(value)
+
+def _max_numeric_id(values: List[str]) -> int:
+    """Highest integer ID among column values, ignoring blanks and non-numeric cells"""
+    # isdecimal() accepts exactly the digit strings int() parses, so no ValueError path is needed
+    return max((int(value) for value in values if value.isdecimal()), default=0)
+
+def _created_at_key(record: Dict[str, Any]) -> str:
+    """Sort key ordering records by creation time"""
+    return record.get('Created_At', '')
+
 class GoogleSheetsKYCDatabase:
     """Google Sheets database manager for KYC data storage"""
     
     def __init__(self):
         self.gc = None
-        self.drive_service = None
-        self.sheets_service = None
         self.spreadsheet = None
         self.initialized = False
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.executor = _SHEETS_EXECUTOR
+        self._write_queue = None
+        self._write_task = None
+        self._row_index: Dict[str, OrderedDict] = {}
+        self._worksheet_handles: Dict[str, gspread.Worksheet] = {}
+        
+        # In-memory mirror of PAN_Records, refreshed periodically and kept current by store_pan_data
+        self._pan_rows: Dict[int, List[str]] = {}  # row number -> raw cell values, padded to the headers
+        self._pan_index: Dict[str, int] = {}  # PAN number -> row number
+        self._phone_index: Dict[str, List[int]] = {}  # phone number -> row numbers
+        self._email_index: Dict[str, List[int]] = {}  # lowercased email -> row numbers
+        self._name_search_index = None  # (lowercased names blob, row start offsets, row numbers, lowercased name -> row numbers), built on demand
+        self._created_index = None  # (Created_At values ascending, matching row numbers), built on demand
+        self._pan_records_loaded = False
+        self._pan_records_loaded_at = 0.0
+        self._pan_records_lock = asyncio.Lock()  # one reload at a time, however many searches find the mirror stale
+        self._pan_writes = 0  # writes mirrored so far, to detect writes racing a reload
+        
+        # Full-sheet reads of other worksheets, keyed by worksheet key
+        self._records_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
         
         # Configuration
         self.spreadsheet_name = os.getenv("KYC_SPREADSHEET_NAME", "KYC_Verification_Database")
@@ -63,16 +301,23 @@ class GoogleSheetsKYCDatabase:
             # Initialize credentials
             creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
             
-            # Initialize gspread client
+            # Initialize gspread client; its AuthorizedSession keeps connections
+            # alive and also serves the few raw Drive calls made here
             self.gc = gspread.authorize(creds)
             
-            # Initialize Google Drive and Sheets services
-            self.drive_service = build('drive', 'v3', credentials=creds)
-            self.sheets_service = build('sheets', 'v4', credentials=creds)
+            # Size the keep-alive pool so no executor thread has to open a throwaway connection
+            self.gc.session.mount(
+                'https://',
+                HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+            )
             
             # Initialize or find spreadsheet
             await self._initialize_spreadsheet()
             
+            # Start background writer for log rows
+            self._write_queue = asyncio.Queue(maxsize=_WRITE_QUEUE_SIZE)
+            self._write_task = asyncio.create_task(self._write_flush_loop())
+            
             self.initialized = True
             logger.info("Google Sheets database initialized successfully")
             
@@ -80,34 +325,45 @@ class GoogleSheetsKYCDatabase:
             logger.error(f"Failed to initialize Google Sheets database: {str(e)}")
             raise
     
-    async def _run_sync(self, func, *args, **kwargs):
-        """Run synchronous function in thread pool - FIXED VERSION"""
-        loop = asyncio.get_event_loop()
-        # Use partial to properly handle args and kwargs
-        if kwargs:
-            func_with_args = partial(func, *args, **kwargs)
-            return await loop.run_in_executor(self.executor, func_with_args)
-        else:
-            return await loop.run_in_executor(self.executor, func, *args)
+    async def _run_sync(self, func, *args, idempotent: bool = True):
+        """Run synchronous function in thread pool; wrap calls needing keyword arguments in a closure
+        
+        Quota (429) and transient server errors are retried with capped, jittered exponential backoff.
+        Calls that are not safe to repeat, such as appends, pass idempotent=False and are only retried on 429.
+        """
+        loop = asyncio.get_running_loop()
+        retry_status_codes = _RETRY_STATUS_CODES if idempotent else _WRITE_RETRY_STATUS_CODES
+        for attempt in range(_MAX_RETRIES):
+            try:
+                return await loop.run_in_executor(self.executor, func, *args)
+            except gspread.exceptions.APIError as e:
+                status = getattr(e.response, 'status_code', None)
+                if status not in retry_status_codes or attempt == _MAX_RETRIES - 1:
+                    raise
+                wait_time = min(_RETRY_MAX_DELAY, 2 ** attempt) + random.random()
+                logger.warning("Google API returned %s, retry %d/%d in %.1fs", status, attempt + 1, _MAX_RETRIES - 1, wait_time)
+                await asyncio.sleep(wait_time)
     
     async def _initialize_spreadsheet(self):
         """Initialize or find the KYC spreadsheet"""
         try:
+            setup = []
+            
             # Try to find existing spreadsheet
             try:
                 self.spreadsheet = await self._run_sync(self.gc.open, self.spreadsheet_name)
                 logger.info(f"Found existing spreadsheet: {self.spreadsheet_name}")
             except gspread.SpreadsheetNotFound:
                 # Create new spreadsheet
-                self.spreadsheet = await self._run_sync(self.gc.create, self.spreadsheet_name)
+                self.spreadsheet = await self._run_sync(self.gc.create, self.spreadsheet_name, idempotent=False)
                 logger.info(f"Created new spreadsheet: {self.spreadsheet_name}")
                 
                 # Move to specific folder if specified
                 if self.folder_id:
-                    await self._move_to_folder()
+                    setup.append(self._move_to_folder())
             
-            # Initialize worksheets
-            await self._initialize_worksheets()
+            # Initialize worksheets, concurrently with the folder move
+            await asyncio.gather(self._initialize_worksheets(), *setup)
             
         except Exception as e:
             logger.error(f"Error initializing spreadsheet: {str(e)}")
@@ -119,12 +375,16 @@ class GoogleSheetsKYCDatabase:
             file_id = self.spreadsheet.id
             # Remove from root and add to folder
             def move_file():
-                return self.drive_service.files().update(
-                    fileId=file_id,
-                    addParents=self.folder_id,
-                    removeParents='root',
-                    fields='id, parents'
-                ).execute()
+                return self.gc.request(
+                    'patch',
+                    f"{_DRIVE_FILES_URL}/{file_id}",
+                    params={
+                        'addParents': self.folder_id,
+                        'removeParents': 'root',
+                        'fields': 'id, parents'
+                    },
+                    json={}
+                ).json()
             
             await self._run_sync(move_file)
             logger.info(f"Moved spreadsheet to folder: {self.folder_id}")
@@ -134,96 +394,129 @@ class GoogleSheetsKYCDatabase:
     async def _initialize_worksheets(self):
         """Initialize all required worksheets with headers"""
         try:
-            # Universal Records worksheet
-            await self._ensure_worksheet_exists('universal_records', [
-                'ID', 'PAN_Number', 'Aadhaar_Number', 'Voter_ID', 'Driving_License', 
-                'Passport_Number', 'GSTIN', 'TAN_Number', 'Bank_Account',
-                'Full_Name', 'First_Name', 'Middle_Name', 'Last_Name', 'Father_Name',
-                'Gender', 'DOB', 'Category', 'Is_Minor',
-                'Phone_Number', 'Email', 'Address_Data',
-                'Company_Name', 'Business_Type', 'Incorporation_Date',
-                'IFSC_Code', 'Bank_Name', 'Branch_Name', 'UPI_ID',
-                'Aadhaar_Linked', 'DOB_Verified', 'Verification_Status',
-                'Last_Verification_Type', 'Verification_Source', 'Verification_Count',
-                'Confidence_Score', 'Verification_History', 'Raw_Responses',
-                'Extra_Data', 'Created_At', 'Updated_At', 'Last_Verified_At'
-            ])
-            
-            # PAN Records worksheet (legacy compatibility)
-            await self._ensure_worksheet_exists('pan_records', [
-                'ID', 'PAN_Number', 'Full_Name', 'First_Name', 'Middle_Name', 'Last_Name',
-                'Father_Name', 'Email', 'Phone_Number', 'Gender', 'DOB', 'Category',
-                'Is_Minor', 'Address_Data', 'Masked_Aadhaar', 'Aadhaar_Linked',
-                'DOB_Verified', 'Less_Info', 'Raw_API_Data', 'API_Endpoint',
-                'Verification_Count', 'Created_At', 'Updated_At', 'Last_Verified_At'
-            ])
-            
-            # Search History worksheet
-            await self._ensure_worksheet_exists('search_history', [
-                'ID', 'Search_Type', 'Search_Query', 'Results_Count', 'Search_Timestamp'
-            ])
-            
-            # Audit Log worksheet
-            await self._ensure_worksheet_exists('audit_log', [
-                'ID', 'Record_ID', 'Action', 'Changed_Fields', 'Old_Values', 
-                'New_Values', 'Timestamp'
-            ])
+            # One metadata read tells us which worksheets already exist
+            def get_sheet_properties():
+                metadata = self.spreadsheet.fetch_sheet_metadata({'fields': 'sheets.properties'})
+                return [sheet['properties'] for sheet in metadata.get('sheets', [])]
             
-        except Exception as e:
-            logger.error(f"Error initializing worksheets: {str(e)}")
-            raise
-    
-    async def _ensure_worksheet_exists(self, worksheet_key: str, headers: List[str]):
-        """Ensure worksheet exists with proper headers - FIXED VERSION"""
-        worksheet_name = self.worksheets[worksheet_key]
-        
-        try:
-            # Try to get existing worksheet
-            def get_worksheet():
-                return self.spreadsheet.worksheet(worksheet_name)
+            sheet_properties = {props['title']: props for props in await self._run_sync(get_sheet_properties)}
+            missing_keys = [key for key, name in self.worksheets.items() if name not in sheet_properties]
+            existing_keys = [key for key in self.worksheets if key not in missing_keys]
             
-            try:
-                worksheet = await self._run_sync(get_worksheet)
-                
-                # Check if headers are set
-                def get_headers():
-                    return worksheet.row_values(1)
+            current_headers = {}
+            
+            # Create all missing worksheets with a single batchUpdate
+            async def create_missing_worksheets():
+                if not missing_keys:
+                    return
                 
-                existing_headers = await self._run_sync(get_headers)
-                if not existing_headers or existing_headers != headers:
-                    # Update headers
-                    def update_headers():
-                        return worksheet.update('A1', [headers])
-                    
-                    await self._run_sync(update_headers)
-                    logger.info(f"Updated headers for worksheet: {worksheet_name}")
-                    
-            except gspread.WorksheetNotFound:
-                # Create new worksheet
-                def add_worksheet():
-                    return self.spreadsheet.add_worksheet(
-                        title=worksheet_name,
-                        rows=1000,
-                        cols=len(headers)
-                    )
+                def add_worksheets():
+                    return self.spreadsheet.batch_update({
+                        'requests': [
+                            {
+                                'addSheet': {
+                                    'properties': {
+                                        'title': self.worksheets[key],
+                                        'sheetType': 'GRID',
+                                        'gridProperties': {
+                                            'rowCount': 1000,
+                                            'columnCount': len(_WORKSHEET_HEADERS[key])
+                                        }
+                                    }
+                                }
+                            }
+                            for key in missing_keys
+                        ]
+                    })
                 
-                worksheet = await self._run_sync(add_worksheet)
+                response = await self._run_sync(add_worksheets, idempotent=False)
+                for reply in response.get('replies', []):
+                    props = reply['addSheet']['properties']
+                    sheet_properties[props['title']] = props
+                for key in missing_keys:
+                    self._seed_next_id(key, 1)
+                    logger.info(f"Created new worksheet: {self.worksheets[key]}")
+            
+            # Read the header rows and ID columns of existing worksheets in one values.batchGet
+            async def read_existing_worksheets():
+                if not existing_keys:
+                    return
                 
-                # Add headers
-                def add_headers():
-                    return worksheet.update('A1', [headers])
+                def get_header_rows():
+                    return self.spreadsheet.values_batch_get(
+                        [absolute_range_name(self.worksheets[key], '1:1') for key in existing_keys] +
+                        [absolute_range_name(self.worksheets[key], 'A:A') for key in existing_keys]
+                    )
                 
-                await self._run_sync(add_headers)
-                logger.info(f"Created new worksheet: {worksheet_name}")
+                response = await self._run_sync(get_header_rows)
+                value_ranges = response.get('valueRanges', [])
+                for key, value_range in zip(existing_keys, value_ranges):
+                    values = value_range.get('values', [])
+                    current_headers[key] = values[0] if values else []
+                for key, value_range in zip(existing_keys, value_ranges[len(existing_keys):]):
+                    id_values = [row[0] for row in value_range.get('values', [])[1:] if row]  # Skip header
+                    self._seed_next_id(key, _max_numeric_id(id_values) + 1)
+            
+            # The two touch disjoint worksheets, so run them concurrently
+            await asyncio.gather(create_missing_worksheets(), read_existing_worksheets())
+            
+            # Keep a handle per worksheet so later calls skip the metadata lookup
+            for key, name in self.worksheets.items():
+                if name in sheet_properties:
+                    self._worksheet_handles[key] = gspread.Worksheet(self.spreadsheet, sheet_properties[name])
+            
+            # Write every new or stale header row with a single values.batchUpdate
+            stale_keys = [
+                key for key in self.worksheets
+                if current_headers.get(key) != _WORKSHEET_HEADERS[key]
+            ]
+            if stale_keys:
+                def update_header_rows():
+                    return self.spreadsheet.values_batch_update(body={
+                        'valueInputOption': 'RAW',
+                        'data': [
+                            {
+                                'range': absolute_range_name(
+                                    self.worksheets[key], _header_range(_WORKSHEET_HEADERS[key])
+                                ),
+                                'values': [_WORKSHEET_HEADERS[key]]
+                            }
+                            for key in stale_keys
+                        ]
+                    })
                 
+                await self._run_sync(update_header_rows)
+                for key in stale_keys:
+                    if key in existing_keys:
+                        logger.info(f"Updated headers for worksheet: {self.worksheets[key]}")
+            
         except Exception as e:
-            logger.error(f"Error ensuring worksheet exists: {str(e)}")
+            logger.error(f"Error initializing worksheets: {str(e)}")
             raise
     
+    async def _get_worksheet(self, worksheet_key: str):
+        """Worksheet handle for a key, cached after the first lookup"""
+        worksheet = self._worksheet_handles.get(worksheet_key)
+        if worksheet is None:
+            worksheet = await self._run_sync(self.spreadsheet.worksheet, self.worksheets[worksheet_key])
+            self._worksheet_handles[worksheet_key] = worksheet
+        return worksheet
+    
     async def close(self):
         """Close connections and cleanup"""
-        if self.executor:
-            self.executor.shutdown(wait=True)
+        if self._write_task:
+            self._write_task.cancel()
+            try:
+                await self._write_task
+            except asyncio.CancelledError:
+                pass
+            self._write_task = None
+            await self._flush_writes()
+            
+            # Nothing flushes the queue from here on; later log rows are appended directly
+            self._write_queue = None
+        
+        # The executor is shared with other instances and lives as long as the process
         logger.info("Google Sheets database connections closed")
     
     async def store_pan_data(self, pan_data: Dict[str, Any], api_endpoint: str = None) -> Optional[Dict[str, Any]]:
@@ -237,60 +530,38 @@ class GoogleSheetsKYCDatabase:
                 logger.warning("No PAN number found in data, skipping storage")
                 return None
             
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['pan_records'])
-            
-            worksheet = await self._run_sync(get_worksheet)
+            worksheet = await self._get_worksheet('pan_records')
             
             # Check if record exists
-            existing_row = await self._find_pan_record(worksheet, pan_number)
-            
-            # Prepare row data
-            timestamp = datetime.utcnow().isoformat()
-            address_json = json.dumps(pan_data.get('address')) if pan_data.get('address') else ""
-            raw_data_json = json.dumps(pan_data)
-            
-            row_data = [
-                existing_row['row_num'] if existing_row else await self._get_next_id('pan_records'),
-                pan_data.get('pan_number', ''),
-                pan_data.get('full_name', ''),
-                pan_data.get('first_name', ''),
-                pan_data.get('middle_name', ''),
-                pan_data.get('last_name', ''),
-                pan_data.get('father_name', ''),
-                pan_data.get('email', ''),
-                pan_data.get('phone_number', ''),
-                pan_data.get('gender', ''),
-                pan_data.get('dob', ''),
-                pan_data.get('category', ''),
-                pan_data.get('is_minor', ''),
-                address_json,
-                pan_data.get('masked_aadhaar', ''),
-                pan_data.get('aadhaar_linked', ''),
-                pan_data.get('dob_verified', ''),
-                pan_data.get('less_info', ''),
-                raw_data_json,
-                api_endpoint or '',
-                existing_row['verification_count'] + 1 if existing_row else 1,
-                existing_row['created_at'] if existing_row else timestamp,
-                timestamp,
-                timestamp
-            ]
+            existing = await self._match_pan_record(pan_number)
+            existing_row = existing['row_num'] if existing else None
+            
+            # Prepare row data; JSON columns are serialized in the executor thread, right before the write
+            timestamp = _utc_timestamp()
+            row_id = existing_row or await self._get_next_id('pan_records')
+            existing_record = existing['record'] if existing else None
             
             if existing_row:
                 # Update existing row
                 def update_row():
-                    return worksheet.update(f"A{existing_row['row_num']}", [row_data])
+                    row_data = _pan_row(pan_data, api_endpoint, row_id, existing_record, timestamp)
+                    worksheet.update(f"A{existing_row}", [row_data])
+                    return row_data
                 
-                await self._run_sync(update_row)
-                logger.info(f"Updated existing PAN record for {pan_number}")
+                row_data = await self._run_sync(update_row)
+                self._index_pan_row(existing_row, row_data)
+                logger.info("Updated existing PAN record for %s", pan_number)
             else:
                 # Add new row
                 def append_row():
-                    return worksheet.append_row(row_data)
+                    row_data = _pan_row(pan_data, api_endpoint, row_id, None, timestamp)
+                    return row_data, worksheet.append_row(row_data, insert_data_option='INSERT_ROWS', table_range='A1')
                 
-                await self._run_sync(append_row)
-                logger.info(f"Created new PAN record for {pan_number}")
+                row_data, response = await self._run_sync(append_row, idempotent=False)
+                row_num = _appended_row_number(response)
+                self._remember_row('pan_records', 'PAN_Number', pan_number, row_num)
+                self._index_pan_row(row_num, row_data)
+                logger.info("Created new PAN record for %s", pan_number)
             
             return {'id': row_data[0], 'pan_number': pan_number}
             
@@ -298,56 +569,115 @@ class GoogleSheetsKYCDatabase:
             logger.error(f"Error storing PAN data: {str(e)}")
             return None
     
-    async def _find_pan_record(self, worksheet, pan_number: str) -> Optional[Dict[str, Any]]:
-        """Find existing PAN record"""
-        try:
-            def get_all_records():
-                return worksheet.get_all_records()
-            
-            records = await self._run_sync(get_all_records)
-            
-            for i, record in enumerate(records, start=2):  # Start from row 2 (after headers)
-                if record.get('PAN_Number') == pan_number:
-                    return {
-                        'row_num': i,
-                        'verification_count': int(record.get('Verification_Count', 0)),
-                        'created_at': record.get('Created_At', '')
-                    }
+    async def bulk_store_pan_data(self, pan_records: List[Dict[str, Any]], api_endpoint: str = None) -> List[Optional[Dict[str, Any]]]:
+        """Store many PAN records with one batchUpdate for existing rows and one values.append for new ones
+        
+        Returns one result per input record, in input order; None for records that were not stored.
+        """
+        if not self.initialized or not DATABASE_ENABLED:
+            return [None] * len(pan_records)
             
-            return None
+        try:
+            # The last entry wins when a PAN number is repeated
+            latest = {}
+            for pan_data in pan_records:
+                if pan_data.get('pan_number'):
+                    latest[pan_data['pan_number']] = pan_data
+                else:
+                    logger.warning("No PAN number found in data, skipping storage")
+            if not latest:
+                return [None] * len(pan_records)
+            
+            worksheet = await self._get_worksheet('pan_records')
+            timestamp = _utc_timestamp()
+            
+            updates = []
+            appends = []
+            for pan_number, pan_data in latest.items():
+                existing = await self._match_pan_record(pan_number)
+                if existing:
+                    updates.append((existing['row_num'], pan_data, existing['record']))
+                else:
+                    appends.append(pan_data)
+            first_id = await self._get_next_id('pan_records', len(appends)) if appends else 0
+            
+            # Existing rows are rewritten in place; new rows go in with values.append, which reports where they landed
+            def write_rows():
+                update_rows = [
+                    (row_num, _pan_row(pan_data, api_endpoint, row_num, record, timestamp))
+                    for row_num, pan_data, record in updates
+                ]
+                append_rows = [
+                    _pan_row(pan_data, api_endpoint, first_id + i, None, timestamp)
+                    for i, pan_data in enumerate(appends)
+                ]
+                if update_rows:
+                    self.spreadsheet.batch_update({'requests': [
+                        {
+                            'updateCells': {
+                                'start': {'sheetId': worksheet.id, 'rowIndex': row_num - 1, 'columnIndex': 0},
+                                'rows': _row_cells([row_data]),
+                                'fields': 'userEnteredValue'
+                            }
+                        }
+                        for row_num, row_data in update_rows
+                    ]})
+                response = None
+                if append_rows:
+                    response = self.spreadsheet.values_append(
+                        absolute_range_name(self.worksheets['pan_records'], 'A1'),
+                        params={'valueInputOption': 'RAW', 'insertDataOption': 'INSERT_ROWS'},
+                        body={'values': append_rows}
+                    )
+                return update_rows, append_rows, response
+            
+            update_rows, append_rows, response = await self._run_sync(write_rows, idempotent=not appends)
+            
+            for row_num, row_data in update_rows:
+                self._index_pan_row(row_num, row_data)
+            first_row = _appended_row_number(response) if append_rows else None
+            for i, row_data in enumerate(append_rows):
+                row_num = first_row + i if first_row else None
+                self._remember_row('pan_records', 'PAN_Number', row_data[1], row_num)
+                self._index_pan_row(row_num, row_data)
+            logger.info("Bulk stored %d PAN records (%d updated, %d created)",
+                        len(latest), len(update_rows), len(append_rows))
+            
+            results = {
+                row_data[1]: {'id': row_data[0], 'pan_number': row_data[1]}
+                for row_data in [row for _, row in update_rows] + append_rows
+            }
+            return [results.get(pan_data.get('pan_number')) for pan_data in pan_records]
             
         except Exception as e:
-            logger.error(f"Error finding PAN record: {str(e)}")
-            return None
+            logger.error(f"Error bulk storing PAN data: {str(e)}")
+            return [None] * len(pan_records)
     
-    async def _get_next_id(self, worksheet_key: str) -> int:
-        """Get next available ID for a worksheet"""
-        try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets[worksheet_key])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            # Get all values in first column
-            def get_col_values():
-                return worksheet.col_values(1)
-            
-            values = await self._run_sync(get_col_values)
-            
-            # Find highest numeric ID
-            max_id = 0
-            for value in values[1:]:  # Skip header
+    def _next_id_key(self, worksheet_key: str) -> Tuple[str, str]:
+        """Key of a worksheet's ID counter in the shared _next_ids"""
+        return (self.spreadsheet.id, self.worksheets[worksheet_key])
+    
+    def _seed_next_id(self, worksheet_key: str, next_id: int):
+        """Seed a worksheet's ID counter, never moving it below IDs already handed out"""
+        counter_key = self._next_id_key(worksheet_key)
+        _next_ids[counter_key] = max(_next_ids.get(counter_key, 0), next_id)
+    
+    async def _get_next_id(self, worksheet_key: str, count: int = 1) -> int:
+        """Reserve count consecutive IDs for a worksheet and return the first"""
+        async with _next_id_lock:
+            counter_key = self._next_id_key(worksheet_key)
+            if counter_key not in _next_ids:
                 try:
-                    if value and int(value) > max_id:
-                        max_id = int(value)
-                except ValueError:
-                    continue
-            
-            return max_id + 1
-            
-        except Exception as e:
-            logger.error(f"Error getting next ID: {str(e)}")
-            return 1
+                    worksheet = await self._get_worksheet(worksheet_key)
+                    values = await self._run_sync(worksheet.col_values, 1)
+                    self._seed_next_id(worksheet_key, _max_numeric_id(values[1:]) + 1)  # Skip header
+                except Exception as e:
+                    logger.error(f"Error getting next ID: {str(e)}")
+                    return 1
+            
+            next_id = _next_ids[counter_key]
+            _next_ids[counter_key] = next_id + count
+            return next_id
     
     async def search_by_pan(self, pan_number: str) -> Optional[Dict[str, Any]]:
         """Search for record by PAN number"""
@@ -355,21 +685,12 @@ class GoogleSheetsKYCDatabase:
             return None
             
         try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['pan_records'])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            def get_all_records():
-                return worksheet.get_all_records()
+            match = await self._match_pan_record(pan_number.upper())
             
-            records = await self._run_sync(get_all_records)
-            
-            for record in records:
-                if record.get('PAN_Number') == pan_number.upper():
-                    # Log search
-                    await self._log_search('pan_number', pan_number, 1)
-                    return self._convert_sheet_record_to_dict(record)
+            if match:
+                # Log search
+                await self._log_search('pan_number', pan_number, 1)
+                return self._convert_sheet_record_to_dict(match['record'])
             
             await self._log_search('pan_number', pan_number, 0)
             return None
@@ -378,37 +699,249 @@ class GoogleSheetsKYCDatabase:
             logger.error(f"Error searching by PAN: {str(e)}")
             return None
     
+    async def _match_pan_record(self, pan_number: str) -> Optional[Dict[str, Any]]:
+        """Locate a PAN_Records row by PAN number, from the in-memory index when it is loaded"""
+        if await self._ensure_pan_records():
+            row_num = self._pan_index.get(pan_number)
+            return {'row_num': row_num, 'record': self._pan_record(row_num)} if row_num else None
+        
+        worksheet = await self._get_worksheet('pan_records')
+        return await self._find_record_by_column(worksheet, 'pan_records', 'PAN_Number', pan_number)
+    
+    async def _find_record_by_column(self, worksheet, worksheet_key: str, column: str, value: str) -> Optional[Dict[str, Any]]:
+        """Find the first row whose column equals value, fetching one column and one row only"""
+        headers = _WORKSHEET_HEADERS[worksheet_key]
+        col_index = headers.index(column)
+        
+        # Re-read a remembered row directly, as long as its key still matches
+        row_num = self._cached_row(worksheet_key, column, value)
+        if row_num:
+            row = await self._run_sync(worksheet.row_values, row_num)
+            if len(row) > col_index and row[col_index] == value:
+                return {'row_num': row_num, 'record': _row_to_record(headers, row)}
+        
+        column_values = await self._run_sync(worksheet.col_values, col_index + 1)
+        
+        try:
+            row_num = column_values.index(value, 1) + 1  # Skip header, rows are 1-based
+        except ValueError:
+            return None
+        
+        self._remember_row(worksheet_key, column, value, row_num)
+        row = await self._run_sync(worksheet.row_values, row_num)
+        return {'row_num': row_num, 'record': _row_to_record(headers, row)}
+    
+    def _remember_row(self, worksheet_key: str, column: str, value: str, row_num: Optional[int]):
+        """Remember the row holding a key value, evicting the oldest entries past the size bound"""
+        if not row_num:
+            return
+        index = self._row_index.setdefault(worksheet_key, OrderedDict())
+        index[(column, value)] = (row_num, time.monotonic())
+        index.move_to_end((column, value))
+        while len(index) > _ROW_INDEX_MAX_SIZE:
+            index.popitem(last=False)
+    
+    def _cached_row(self, worksheet_key: str, column: str, value: str) -> Optional[int]:
+        """Remembered row for a key value, if still fresh"""
+        entry = self._row_index.get(worksheet_key, {}).get((column, value))
+        if entry and time.monotonic() - entry[1] < _ROW_INDEX_TTL:
+            return entry[0]
+        return None
+    
+    async def _ensure_pan_records(self) -> bool:
+        """Load or refresh the in-memory PAN_Records mirror if needed; False if it is unavailable
+        
+        The mirror is loaded on first use, so managers that never touch PAN_Records never download it.
+        """
+        if self._pan_records_stale():
+            async with self._pan_records_lock:
+                # Searches that waited here find the mirror already reloaded by the first one
+                if self._pan_records_stale():
+                    try:
+                        await self._load_pan_records()
+                    except Exception as e:
+                        logger.warning(f"Could not load PAN records into memory: {str(e)}")
+        return self._pan_records_loaded
+    
+    def _pan_records_stale(self) -> bool:
+        """Whether the PAN_Records mirror is missing or past its TTL"""
+        return not self._pan_records_loaded or time.monotonic() - self._pan_records_loaded_at >= _RECORDS_CACHE_TTL
+    
+    async def _load_pan_records(self):
+        """Rebuild the PAN_Records mirror and its indexes from a single values.get"""
+        writes_before = self._pan_writes
+        
+        def get_rows():
+            response = self.spreadsheet.values_get(absolute_range_name(self.worksheets['pan_records']))
+            return response.get('values', [])
+        
+        rows = await self._run_sync(get_rows)
+        
+        self._pan_rows.clear()
+        self._name_search_index = None
+        self._created_index = None
+        self._pan_index.clear()
+        self._phone_index.clear()
+        self._email_index.clear()
+        for row_num, row in enumerate(rows[1:], start=2):  # Skip header, rows are 1-based
+            if any(row):
+                self._index_pan_row_values(row_num, row)
+        self._pan_records_loaded = True
+        
+        # A write that landed while the sheet was being read may be missing, so refresh again on next use
+        self._pan_records_loaded_at = time.monotonic() if self._pan_writes == writes_before else 0.0
+    
+    def _index_pan_row(self, row_num: Optional[int], row_data: List[Any]):
+        """Mirror a row just written to PAN_Records"""
+        if not row_num:
+            # Row position unknown, rebuild the mirror on next use
+            self._invalidate_pan_records()
+            return
+        self._pan_writes += 1
+        self._invalidate_records('pan_records')
+        if not self._pan_records_loaded:
+            return
+        # Stored as Sheets formats them, so mirrored rows match the same rows after a reload
+        self._index_pan_row_values(row_num, [_sheet_text(value) for value in row_data])
+    
+    def _invalidate_pan_records(self):
+        """Drop the PAN_Records mirror after writes it cannot follow; it is reloaded on next use"""
+        self._pan_writes += 1
+        self._invalidate_records('pan_records')
+        self._pan_records_loaded = False
+    
+    def _index_pan_row_values(self, row_num: int, row: List[str]):
+        """Add or replace one raw row in the PAN_Records mirror and its indexes"""
+        row = (list(row) + [''] * _PAN_WIDTH)[:_PAN_WIDTH]
+        previous = self._pan_rows.get(row_num)
+        if previous:
+            pan_number = previous[_PAN_COLUMNS['PAN_Number']]
+            if self._pan_index.get(pan_number) == row_num:
+                del self._pan_index[pan_number]
+            for index, key in ((self._phone_index, previous[_PAN_COLUMNS['Phone_Number']]),
+                               (self._email_index, previous[_PAN_COLUMNS['Email']].lower())):
+                rows = index.get(key)
+                if rows and row_num in rows:
+                    rows.remove(row_num)
+                    if not rows:
+                        del index[key]
+        
+        self._pan_rows[row_num] = row
+        self._name_search_index = None
+        self._created_index = None
+        pan_number = row[_PAN_COLUMNS['PAN_Number']]
+        if pan_number:
+            self._pan_index.setdefault(pan_number, row_num)
+        phone_number = row[_PAN_COLUMNS['Phone_Number']]
+        if phone_number:
+            bisect.insort(self._phone_index.setdefault(phone_number, []), row_num)
+        # Blank addresses are indexed too, so an empty search still matches every row
+        email = row[_PAN_COLUMNS['Email']].lower()
+        bisect.insort(self._email_index.setdefault(email, []), row_num)
+    
+    def _pan_record(self, row_num: int) -> Dict[str, Any]:
+        """get_all_records()-style dict for one mirrored row, built only when a caller needs it"""
+        return _row_to_record(_PAN_HEADERS, self._pan_rows[row_num])
+    
+    def _created_order(self) -> Tuple[List[str], List[int]]:
+        """Created_At values in ascending order with their row numbers; ties keep sheet order when read backwards"""
+        if self._created_index is None:
+            created_at = _PAN_COLUMNS['Created_At']
+            rows = self._pan_rows
+            row_nums = sorted(rows, key=lambda row_num: (rows[row_num][created_at], -row_num))
+            self._created_index = ([rows[row_num][created_at] for row_num in row_nums], row_nums)
+        return self._created_index
+    
+    def _name_index(self) -> Tuple[str, List[int], List[int], Dict[str, List[int]]]:
+        """Name columns of every mirrored row, lowercased once and reused until the mirror changes"""
+        if self._name_search_index is None:
+            exact_rows = {}
+            segments = []
+            starts = []
+            offset = 0
+            name_columns = [_PAN_COLUMNS[field] for field in _NAME_FIELDS]
+            for row_num, row in self._pan_rows.items():
+                row_names = [row[column].lower() for column in name_columns]
+                for row_name in set(row_names):
+                    exact_rows.setdefault(row_name, []).append(row_num)
+                segment = _NAME_FIELD_SEPARATOR.join(row_names)
+                starts.append(offset)
+                segments.append(segment)
+                offset += len(segment) + 1
+            self._name_search_index = (_NAME_SEGMENT_SEPARATOR.join(segments), starts, list(self._pan_rows), exact_rows)
+        return self._name_search_index
+    
+    def _find_name_rows(self, search_name: str) -> List[int]:
+        """Rows whose full, first or last name contains search_name (already lowercased)"""
+        blob, starts, row_nums, _ = self._name_index()
+        rows = []
+        if not starts:
+            return rows
+        
+        # One C-level find per matching row, skipping to the next row after each hit
+        position = blob.find(search_name)
+        while position != -1:
+            index = bisect.bisect_right(starts, position) - 1
+            rows.append(row_nums[index])
+            if index + 1 == len(starts):
+                break
+            position = blob.find(search_name, starts[index + 1])
+        return rows
+    
+    async def _get_pan_records(self) -> List[Dict[str, Any]]:
+        """All PAN_Records rows, served from memory when the mirror is loaded"""
+        if await self._ensure_pan_records():
+            return [_row_to_record(_PAN_HEADERS, row) for row in self._pan_rows.values()]
+        
+        return await self._get_records('pan_records')
+    
+    async def _get_records(self, worksheet_key: str) -> List[Dict[str, Any]]:
+        """get_all_records() of a worksheet, reused for a short while until the next write to it"""
+        cached = self._records_cache.get(worksheet_key)
+        now = time.monotonic()
+        if cached and now - cached[0] < _RECORDS_CACHE_TTL:
+            return cached[1]
+        
+        worksheet = await self._get_worksheet(worksheet_key)
+        records = await self._run_sync(worksheet.get_all_records)
+        self._records_cache[worksheet_key] = (now, records)
+        return records
+    
+    def _invalidate_records(self, worksheet_key: str):
+        """Drop the cached get_all_records() result of a worksheet after writing to it"""
+        self._records_cache.pop(worksheet_key, None)
+    
     async def search_by_name(self, name: str, exact_match: bool = False) -> List[Dict[str, Any]]:
         """Search for records by name"""
         if not self.initialized or not DATABASE_ENABLED:
             return []
             
         try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['pan_records'])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            def get_all_records():
-                return worksheet.get_all_records()
-            
-            records = await self._run_sync(get_all_records)
-            matches = []
-            
-            for record in records:
-                full_name = record.get('Full_Name', '').lower()
-                first_name = record.get('First_Name', '').lower()
-                last_name = record.get('Last_Name', '').lower()
-                search_name = name.lower()
-                
-                if exact_match:
-                    if search_name in [full_name, first_name, last_name]:
-                        matches.append(self._convert_sheet_record_to_dict(record))
-                else:
-                    if (search_name in full_name or 
-                        search_name in first_name or 
-                        search_name in last_name):
-                        matches.append(self._convert_sheet_record_to_dict(record))
+            search_name = name.lower()
+            
+            mirrored = await self._ensure_pan_records()
+            if mirrored and exact_match:
+                exact_rows = self._name_index()[3]
+                matches = [self._convert_pan_row(row_num) for row_num in exact_rows.get(search_name, [])]
+            elif (mirrored and _NAME_SEGMENT_SEPARATOR not in search_name
+                    and _NAME_FIELD_SEPARATOR not in search_name):
+                matches = [self._convert_pan_row(row_num) for row_num in self._find_name_rows(search_name)]
+            else:
+                records = []
+                for record in await self._get_pan_records():
+                    full_name = record.get('Full_Name', '').lower()
+                    first_name = record.get('First_Name', '').lower()
+                    last_name = record.get('Last_Name', '').lower()
+                    
+                    if exact_match:
+                        if search_name in (full_name, first_name, last_name):
+                            records.append(record)
+                    else:
+                        if (search_name in full_name or 
+                            search_name in first_name or 
+                            search_name in last_name):
+                            records.append(record)
+                matches = self._convert_sheet_records_batch(records)
             
             await self._log_search('name', name, len(matches))
             return matches
@@ -423,20 +956,13 @@ class GoogleSheetsKYCDatabase:
             return []
             
         try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['pan_records'])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            def get_all_records():
-                return worksheet.get_all_records()
-            
-            records = await self._run_sync(get_all_records)
-            matches = []
-            
-            for record in records:
-                if record.get('Phone_Number') == phone_number:
-                    matches.append(self._convert_sheet_record_to_dict(record))
+            if await self._ensure_pan_records():
+                matches = [self._convert_pan_row(row_num) for row_num in self._phone_index.get(str(phone_number), [])]
+            else:
+                matches = self._convert_sheet_records_batch([
+                    record for record in await self._get_pan_records()
+                    if record.get('Phone_Number') == phone_number
+                ])
             
             await self._log_search('phone_number', phone_number, len(matches))
             return matches
@@ -451,21 +977,22 @@ class GoogleSheetsKYCDatabase:
             return []
             
         try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['pan_records'])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            def get_all_records():
-                return worksheet.get_all_records()
-            
-            records = await self._run_sync(get_all_records)
-            matches = []
-            
-            for record in records:
-                record_email = record.get('Email', '').lower()
-                if email.lower() in record_email:
-                    matches.append(self._convert_sheet_record_to_dict(record))
+            search_email = email.lower()
+            
+            if await self._ensure_pan_records():
+                # Test each distinct lowercased address once instead of lowering every row
+                row_nums = sorted(
+                    row_num
+                    for record_email, email_rows in self._email_index.items()
+                    if search_email in record_email
+                    for row_num in email_rows
+                )
+                matches = [self._convert_pan_row(row_num) for row_num in row_nums]
+            else:
+                matches = self._convert_sheet_records_batch([
+                    record for record in await self._get_pan_records()
+                    if search_email in record.get('Email', '').lower()
+                ])
             
             await self._log_search('email', email, len(matches))
             return matches
@@ -480,28 +1007,21 @@ class GoogleSheetsKYCDatabase:
             return []
             
         try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['pan_records'])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            def get_all_records():
-                return worksheet.get_all_records()
-            
-            records = await self._run_sync(get_all_records)
-            
-            # Sort by Created_At descending (most recent first)
-            sorted_records = sorted(
-                records, 
-                key=lambda x: x.get('Created_At', ''), 
-                reverse=True
-            )
-            
-            # Apply pagination
-            end_index = offset + limit if limit else len(sorted_records)
-            paginated_records = sorted_records[offset:end_index]
-            
-            return [self._convert_sheet_record_to_dict(record) for record in paginated_records]
+            # Most recent first
+            if await self._ensure_pan_records():
+                # The ascending index is read backwards, so a page is a slice of it
+                row_nums = self._created_order()[1]
+                end = max(len(row_nums) - offset, 0)
+                start = max(end - limit, 0) if limit else 0
+                return [self._convert_pan_row(row_num) for row_num in reversed(row_nums[start:end])]
+            
+            # With a limit only the top offset + limit rows are ordered
+            records = await self._get_pan_records()
+            if limit:
+                paginated_records = heapq.nlargest(offset + limit, records, key=_created_at_key)[offset:]
+            else:
+                paginated_records = sorted(records, key=_created_at_key, reverse=True)[offset:]
+            return self._convert_sheet_records_batch(paginated_records)
             
         except Exception as e:
             logger.error(f"Error getting all records: {str(e)}")
@@ -513,33 +1033,17 @@ class GoogleSheetsKYCDatabase:
             return {}
             
         try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['pan_records'])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            def get_all_records():
-                return worksheet.get_all_records()
-            
-            records = await self._run_sync(get_all_records)
-            total_records = len(records)
+            if await self._ensure_pan_records():
+                created_values = self._created_order()[0]
+            else:
+                created_values = sorted(record.get('Created_At', '') for record in await self._get_pan_records())
+            total_records = len(created_values)
             
-            # Count records created today
+            # Values are in ascending order: today's records form one run and the most recent is last
             today = datetime.utcnow().date().isoformat()
-            today_records = sum(
-                1 for record in records 
-                if record.get('Created_At', '').startswith(today)
-            )
-            
-            # Get most recent record
-            most_recent = None
-            if records:
-                sorted_records = sorted(
-                    records, 
-                    key=lambda x: x.get('Created_At', ''), 
-                    reverse=True
-                )
-                most_recent = sorted_records[0].get('Created_At')
+            today_records = (bisect.bisect_left(created_values, today + '\uffff')
+                             - bisect.bisect_left(created_values, today))
+            most_recent = created_values[-1] if created_values else None
             
             return {
                 'total_records': total_records,
@@ -556,80 +1060,103 @@ class GoogleSheetsKYCDatabase:
             return {}
     
     async def _log_search(self, search_type: str, query: str, results_count: int):
-        """Log search operation"""
+        """Queue a search operation for the background search history writer"""
+        await self._queue_row('search_history', [search_type, query, results_count, _utc_timestamp()])
+    
+    async def _queue_row(self, worksheet_key: str, values: List[Any]):
+        """Queue a log row for the background writer; the ID column is filled in at flush time
+        
+        After close() there is no writer left to flush the queue, so the row is appended directly.
+        """
+        if self._write_queue is None:
+            if self.initialized:
+                try:
+                    row_id = await self._get_next_id(worksheet_key)
+                    await self._batch_append([(worksheet_key, [[row_id] + values])])
+                except Exception as e:
+                    logger.warning(f"Failed to write {worksheet_key} row: {str(e)}")
+            return
+        
         try:
-            def get_worksheet():
-                return self.spreadsheet.worksheet(self.worksheets['search_history'])
-            
-            worksheet = await self._run_sync(get_worksheet)
-            
-            search_id = await self._get_next_id('search_history')
-            timestamp = datetime.utcnow().isoformat()
-            
-            row_data = [
-                search_id,
-                search_type,
-                query,
-                results_count,
-                timestamp
-            ]
-            
-            def append_row():
-                return worksheet.append_row(row_data)
-            
-            await self._run_sync(append_row)
+            self._write_queue.put_nowait((worksheet_key, values))
+        except asyncio.QueueFull:
+            logger.warning("Write queue full, dropping %s row", worksheet_key)
+    
+    async def _write_flush_loop(self):
+        """Periodically flush queued log rows"""
+        while True:
+            await asyncio.sleep(_WRITE_FLUSH_INTERVAL)
+            await self._flush_writes()
+    
+    async def _flush_writes(self):
+        """Append all queued log rows, one API call per batch across all worksheets"""
+        queue = self._write_queue
+        if queue is None:
+            return
+        
+        while not queue.empty():
+            batches: Dict[str, List[List[Any]]] = {}
+            count = 0
+            while not queue.empty() and count < _WRITE_BATCH_SIZE:
+                worksheet_key, values = queue.get_nowait()
+                batches.setdefault(worksheet_key, []).append(values)
+                count += 1
             
-        except Exception as e:
-            logger.warning(f"Failed to log search: {str(e)}")
+            try:
+                entries = []
+                for worksheet_key, batch in batches.items():
+                    first_id = await self._get_next_id(worksheet_key, len(batch))
+                    entries.append((worksheet_key, [[first_id + i] + values for i, values in enumerate(batch)]))
+                
+                await self._batch_append(entries)
+                
+            except Exception as e:
+                logger.warning(f"Failed to write {count} queued rows: {str(e)}")
+    
+    async def _batch_append(self, entries: List[Tuple[str, List[List[Any]]]]):
+        """Append rows to several worksheets with a single spreadsheets.batchUpdate"""
+        requests = []
+        for worksheet_key, rows in entries:
+            worksheet = await self._get_worksheet(worksheet_key)
+            requests.append({
+                'appendCells': {
+                    'sheetId': worksheet.id,
+                    'rows': _row_cells(rows),
+                    'fields': 'userEnteredValue'
+                }
+            })
+        
+        if requests:
+            await self._run_sync(self.spreadsheet.batch_update, {'requests': requests}, idempotent=False)
     
     def _convert_sheet_record_to_dict(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Google Sheets record to standardized dictionary"""
         try:
-            # Parse JSON fields
-            address_data = None
-            if record.get('Address_Data'):
-                try:
-                    address_data = json.loads(record['Address_Data'])
-                except json.JSONDecodeError:
-                    address_data = record['Address_Data']
+            get = record.get
+            converted = {out_key: get(in_key) for in_key, out_key in _RECORD_FIELD_MAP}
             
-            raw_api_data = None
-            if record.get('Raw_API_Data'):
-                try:
-                    raw_api_data = json.loads(record['Raw_API_Data'])
-                except json.JSONDecodeError:
-                    raw_api_data = record['Raw_API_Data']
+            # Parse JSON fields
+            for in_key, out_key in _RECORD_JSON_FIELDS:
+                converted[out_key] = _json_field(get(in_key))
             
-            return {
-                'id': record.get('ID'),
-                'pan_number': record.get('PAN_Number'),
-                'full_name': record.get('Full_Name'),
-                'first_name': record.get('First_Name'),
-                'middle_name': record.get('Middle_Name'),
-                'last_name': record.get('Last_Name'),
-                'father_name': record.get('Father_Name'),
-                'email': record.get('Email'),
-                'phone_number': record.get('Phone_Number'),
-                'gender': record.get('Gender'),
-                'dob': record.get('DOB'),
-                'category': record.get('Category'),
-                'is_minor': record.get('Is_Minor'),
-                'address_data': address_data,
-                'masked_aadhaar': record.get('Masked_Aadhaar'),
-                'aadhaar_linked': record.get('Aadhaar_Linked'),
-                'dob_verified': record.get('DOB_Verified'),
-                'less_info': record.get('Less_Info'),
-                'raw_api_data': raw_api_data,
-                'api_endpoint': record.get('API_Endpoint'),
-                'verification_count': record.get('Verification_Count'),
-                'created_at': record.get('Created_At'),
-                'updated_at': record.get('Updated_At'),
-                'last_verified_at': record.get('Last_Verified_At')
-            }
+            return converted
             
         except Exception as e:
             logger.error(f"Error converting sheet record: {str(e)}")
             return record
+    
+    def _convert_pan_row(self, row_num: int) -> Dict[str, Any]:
+        """_convert_sheet_record_to_dict for a mirrored PAN_Records row, reading cells by position"""
+        values = numericise_all(self._pan_rows[row_num])
+        converted = {out_key: values[index] for out_key, index in _PAN_RECORD_POSITIONS}
+        for out_key, index in _PAN_JSON_POSITIONS:
+            converted[out_key] = _json_field(values[index])
+        return converted
+    
+    def _convert_sheet_records_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert a batch of Google Sheets records to standardized dictionaries"""
+        convert = self._convert_sheet_record_to_dict
+        return [convert(record) for record in records]
 
 # Global instance
 google_sheets_db_manager = GoogleSheetsKYCDatabase()
\ No newline at end of file
@@ -3,152 +3,344 @@
 import asyncio
 import httpx
 import logging
-from typing import Dict, Any, Optional, Union
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Mapping, Optional, Tuple, Union
 import json
 from pathlib import Path
-from contextlib import asynccontextmanager
-import threading
-from weakref import WeakSet
+from contextlib import ExitStack
+from functools import lru_cache
+from types import MappingProxyType
 
 from config import BASE_URL, DEFAULT_HEADERS, MULTIPART_HEADERS, SUREPASS_API_TOKEN, ENDPOINTS
 from models import KYCResponse, APIError
 
+# orjson is optional; request bodies and responses fall back to the standard library json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("kyc-mcp-server")
 
+# Requests in flight at once; callers beyond this wait for a slot instead of failing with PoolTimeout
+MAX_CONCURRENT_REQUESTS = 50
+
+# post_json attempts per request; only transport errors and these gateway statuses are retried.
+# Form uploads are never retried
+MAX_ATTEMPTS = 3
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+RETRY_BASE_DELAY = 0.5  # seconds, doubled per retry
+RETRY_MAX_DELAY = 4.0  # seconds
+
+# Consecutive failures that open the circuit, and how long it stays open before a probe is let through
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0  # seconds
+CIRCUIT_FAILURE_STATUS_CODES = frozenset({408, 500, 502, 503, 504})
+API_HOST = httpx.URL(BASE_URL).host
+
+# All requests go to one origin: over HTTP/2 they share a single multiplexed connection, and the
+# connection limits only come into play if the server falls back to HTTP/1.1
+HTTP_TIMEOUT = httpx.Timeout(
+    60.0,           # Total timeout
+    connect=15.0,   # Connection timeout
+    read=45.0,      # Read timeout
+    write=15.0,     # Write timeout
+    pool=15.0       # Pool timeout
+)
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,   # Idle connections kept warm for the next burst
+    max_connections=MAX_CONCURRENT_REQUESTS,
+    keepalive_expiry=120.0          # Longer keepalive
+)
+
 class ConnectionPool:
-    """Manages HTTP client connection pool for high concurrency"""
+    """Shares one HTTP client, and with it one keep-alive/HTTP/2 connection pool, across all KYC clients"""
     
-    def __init__(self, max_clients: int = 50):
-        self.max_clients = max_clients
-        self.available_clients = None
-        self.active_clients = WeakSet()
-        self._lock = asyncio.Lock()
-        self._initialized = False
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS):
+        self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0  # Requests currently holding a slot
         self.base_url = BASE_URL
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """The shared HTTP client, created on first use"""
+        # AsyncClient() is synchronous, so there is no await between the check and the assignment
+        # and concurrent first callers cannot create two clients
+        if self.client is None:
+            # A single client lets concurrent requests multiplex over the same HTTP/2 connection
+            self.client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                limits=HTTP_LIMITS,
+                verify=True,
+                trust_env=True,
+                follow_redirects=True,
+                # Additional optimizations
+                http2=True  # Enable HTTP/2 for better performance
+            )
+            logger.info("Shared HTTP client initialized")
+        return self.client
+    
     async def initialize(self):
-        """Initialize the connection pool"""
-        if self._initialized:
-            return
-            
-        async with self._lock:
-            if self._initialized:
-                return
-                
-            self.available_clients = asyncio.Queue(maxsize=self.max_clients)
-            
-            # Pre-create HTTP clients with optimized settings
-            for _ in range(self.max_clients):
-                client = httpx.AsyncClient(
-                    timeout=httpx.Timeout(
-                        60.0,           # Total timeout
-                        connect=15.0,   # Connection timeout
-                        read=45.0,      # Read timeout
-                        write=15.0,     # Write timeout
-                        pool=15.0       # Pool timeout
-                    ),
-                    limits=httpx.Limits(
-                        max_keepalive_connections=100,  # Increased for concurrency
-                        max_connections=200,            # Much higher limit
-                        keepalive_expiry=120.0          # Longer keepalive
-                    ),
-                    verify=True,
-                    trust_env=True,
-                    follow_redirects=True,
-                    # Additional optimizations
-                    http2=True  # Enable HTTP/2 for better performance
-                )
-                await self.available_clients.put(client)
-            
-            self._initialized = True
-            logger.info(f"Connection pool initialized with {self.max_clients} clients")
+        """Create the shared HTTP client"""
+        self._get_client()
     
-    @asynccontextmanager
-    async def get_client(self):
-        """Get an HTTP client from the pool with fallback"""
-        if not self._initialized:
-            await self.initialize()
-            
-        client = None
-        is_pool_client = False
-        
-        try:
-            # Try to get client from pool with short timeout
-            try:
-                client = await asyncio.wait_for(
-                    self.available_clients.get(), 
-                    timeout=2.0
-                )
-                is_pool_client = True
-                self.active_clients.add(client)
-            except asyncio.TimeoutError:
-                # Create temporary client if pool is exhausted
-                logger.warning("Connection pool exhausted, creating temporary client")
-                client = self._create_temp_client()
-                is_pool_client = False
-            
-            yield client
-            
-        finally:
-            # Return client to pool if it's a pool client and still valid
-            if client and is_pool_client and not client.is_closed:
-                try:
-                    self.active_clients.discard(client)
-                    await self.available_clients.put(client)
-                except Exception as e:
-                    logger.warning(f"Error returning client to pool: {e}")
-                    await client.aclose()
-            elif client and not is_pool_client:
-                # Close temporary client
-                await client.aclose()
+    async def __aenter__(self) -> httpx.AsyncClient:
+        """Take a request slot, waiting while the concurrent request limit is reached, and return the shared client"""
+        await self._semaphore.acquire()
+        self.in_flight += 1
+        return self._get_client()
     
-    def _create_temp_client(self) -> httpx.AsyncClient:
-        """Create a temporary client with reduced settings"""
-        return httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            limits=httpx.Limits(
-                max_keepalive_connections=5,
-                max_connections=10
-            ),
-            verify=True
-        )
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.in_flight -= 1
+        self._semaphore.release()
     
     async def close_all(self):
-        """Close all clients in the pool"""
-        if not self._initialized:
+        """Close the shared HTTP client and its connections"""
+        if self.client is None:
             return
-            
-        # Close clients in pool
-        while not self.available_clients.empty():
-            try:
-                client = await self.available_clients.get()
-                await client.aclose()
-            except Exception as e:
-                logger.warning(f"Error closing pool client: {e}")
         
-        # Close any remaining active clients
-        for client in list(self.active_clients):
-            try:
-                if not client.is_closed:
-                    await client.aclose()
-            except Exception as e:
-                logger.warning(f"Error closing active client: {e}")
+        if self.in_flight:
+            logger.warning(f"Closing HTTP client with {self.in_flight} requests in flight")
+        # Detach first, so a request starting while this one closes gets a fresh client
+        client, self.client = self.client, None
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client: {e}")
         
         logger.info("All HTTP clients closed")
 
-# Global connection pool instance
-_connection_pool = None
-_pool_lock = threading.Lock()
+class CircuitBreaker:
+    """Fails requests fast while the KYC API keeps failing, letting a single probe through after a cool-down"""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.last_failure_ts = 0.0
+        self._probe_started = 0.0  # When the half-open probe was let through; 0 if none is pending
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently being refused"""
+        return self.state == self.OPEN
+    
+    # State changes never await, so concurrent requests on the event loop need no lock
+    def allow(self) -> bool:
+        """Whether a request may go out now"""
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.last_failure_ts < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_started = 0.0
+        # Half-open: one probe at a time; a probe that never reported back is replaced after the timeout
+        if self._probe_started and now - self._probe_started < self.reset_timeout:
+            return False
+        self._probe_started = now
+        return True
+    
+    def record_success(self):
+        """The API answered; close the circuit"""
+        if self.state != self.CLOSED:
+            logger.info("KYC API recovered, closing circuit")
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self._probe_started = 0.0
+    
+    def record_failure(self):
+        """A request failed at the network level or with a server error"""
+        self.failure_count += 1
+        self.last_failure_ts = time.monotonic()
+        self._probe_started = 0.0
+        if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"KYC API failing ({self.failure_count} consecutive failures), "
+                               f"opening circuit for {self.reset_timeout:.0f} seconds")
+            self.state = self.OPEN
+    
+    def record_response(self, status_code: int):
+        """Record an HTTP response; any status outside CIRCUIT_FAILURE_STATUS_CODES means the API is up"""
+        if status_code in CIRCUIT_FAILURE_STATUS_CODES:
+            self.record_failure()
+        else:
+            self.record_success()
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, so callers that failed together do not retry together"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+def _circuit_open_response() -> KYCResponse:
+    """Response returned without touching the network while the circuit is open"""
+    return KYCResponse(success=False, error=f"Circuit open for {API_HOST}", status_code=503)
+
+# Shared by every client, since all requests go to the same host
+circuit_breaker = CircuitBreaker()
+
+# Global connection pool instance; created at import, which is already serialized by the import lock,
+# and cheap because the HTTP client itself is only created on first use
+_connection_pool = ConnectionPool()
 
 def get_connection_pool() -> ConnectionPool:
     """Get the global connection pool instance"""
-    global _connection_pool
-    if _connection_pool is None:
-        with _pool_lock:
-            if _connection_pool is None:
-                _connection_pool = ConnectionPool(max_clients=50)
     return _connection_pool
 
+def _json_dumps(value: Any) -> bytes:
+    """Encode a JSON request body, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            pass
+    return json.dumps(value).encode()
+
+def _json_loads(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when available; both raise json.JSONDecodeError"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+# Shared read-only default for optional nested objects in API responses
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+# Options sent with every PAN comprehensive v2 request
+_PAN_COMPREHENSIVE_OPTIONS = {
+    "get_father_name": True,   # Get father's name if available
+    "get_address": True,       # Get complete address details
+    "get_gender": True,        # Get gender information
+    "get_minor_flag": True,    # Get minor status
+    "consent": "Y",            # Required for full data access
+    "get_pdf": True,           # Get PDF document if available
+    "get_extra_payload_text": True  # Get any additional information
+}
+
+# Address fields always present in PAN comprehensive responses
+_PAN_ADDRESS_FIELDS = ('line_1', 'line_2', 'street_name', 'zip', 'city', 'state', 'country', 'full')
+
+# Fields always present in PAN comprehensive responses
+_PAN_COMPREHENSIVE_DEFAULTS = {
+    'client_id': None, 'pan_number': None, 'full_name': None,
+    'full_name_split': [], 'masked_aadhaar': None, 'email': None,
+    'phone_number': None, 'gender': None, 'dob': None,
+    'input_dob': None, 'aadhaar_linked': False, 'dob_verified': False,
+    'dob_check': False, 'category': None, 'less_info': False
+}
+
+def _address_value(value: Any) -> Optional[str]:
+    """Stripped text of a scalar address field, None for missing or nested values"""
+    return str(value).strip() if isinstance(value, (str, int)) else None
+
+def _response_data(raw_data: Dict[str, Any], status_code: int) -> Any:
+    """Response data; some endpoints return it at root level"""
+    return raw_data['data'] if 'data' in raw_data else raw_data
+
+def _pan_response_data(raw_data: Dict[str, Any], status_code: int) -> Any:
+    """Basic PAN response data, with the standard fields filled in when it comes at root level"""
+    if 'data' in raw_data:
+        return raw_data['data']
+    raw_data.setdefault('success', True)
+    raw_data.setdefault('status_code', status_code)
+    raw_data.setdefault('message', 'Verification completed')
+    return raw_data
+
+def _pan_comprehensive_response_data(raw_data: Dict[str, Any], status_code: int) -> Any:
+    """PAN comprehensive response data, with a fixed address structure and defaults for missing fields"""
+    data = _response_data(raw_data, status_code)
+    if not isinstance(data, dict):
+        return data
+    
+    # Always set address data in response, with None for missing or non-scalar fields
+    address_response = data.get('address')
+    if not isinstance(address_response, dict):
+        address_response = {}
+    data['address'] = {field: _address_value(address_response.get(field)) for field in _PAN_ADDRESS_FIELDS}
+    
+    # Ensure all required fields are present with defaults
+    for key, default_value in _PAN_COMPREHENSIVE_DEFAULTS.items():
+        if key not in data:
+            # Copy mutable defaults so responses never share them
+            data[key] = default_value.copy() if isinstance(default_value, list) else default_value
+    return data
+
+def _pan_comprehensive_request(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Format specifically for PAN comprehensive v2 endpoint"""
+    return {"id_number": data["id_number"], **_PAN_COMPREHENSIVE_OPTIONS}
+
+def _pan_request(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Basic PAN verification format"""
+    return {"id_number": data["id_number"]}
+
+# Endpoints whose payload is rebuilt before sending; all others send the caller's data as-is
+_REQUEST_PREPARERS = {
+    ENDPOINTS["pan_comprehensive"]: _pan_comprehensive_request,
+    ENDPOINTS["pan"]: _pan_request,
+}
+
+# Endpoints whose response data is normalized; all others go through _response_data
+_RESPONSE_HANDLERS = {
+    ENDPOINTS["pan_comprehensive"]: _pan_comprehensive_response_data,
+    ENDPOINTS["pan"]: _pan_response_data,
+}
+
+@lru_cache(maxsize=64)
+def _build_headers(authorization_token: Optional[str], is_multipart: bool) -> Mapping[str, str]:
+    """Headers for a token, built once and shared read-only between requests"""
+    if is_multipart:
+        headers = {}  # Let httpx set Content-Type for multipart
+    else:
+        headers = DEFAULT_HEADERS.copy()
+
+    if authorization_token:
+        if authorization_token.startswith('Bearer '):
+            headers["Authorization"] = authorization_token
+        else:
+            headers["Authorization"] = f"Bearer {authorization_token}"
+
+    return MappingProxyType(headers)
+
+# Read-only lookups whose successful responses are cached, keyed by endpoint, token and request body
+CACHEABLE_ENDPOINTS = frozenset({ENDPOINTS["pan"], ENDPOINTS["pan_comprehensive"]})
+RESPONSE_CACHE_TTL = 300  # seconds
+RESPONSE_CACHE_MAX_SIZE = 10000
+
+_response_cache: "OrderedDict[Tuple[str, str, bytes], Tuple[KYCResponse, float]]" = OrderedDict()
+
+def _get_cached_response(key: Tuple[str, str, bytes]) -> Optional[KYCResponse]:
+    """Copy of a cached response, if still fresh"""
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    response, stored_at = entry
+    if time.monotonic() - stored_at >= RESPONSE_CACHE_TTL:
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return response.model_copy(deep=True)
+
+def _cache_response(key: Tuple[str, str, bytes], response: KYCResponse):
+    """Remember a copy of a response, evicting the least recently used entries past the size bound"""
+    _response_cache[key] = (response.model_copy(deep=True), time.monotonic())
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > RESPONSE_CACHE_MAX_SIZE:
+        _response_cache.popitem(last=False)
+
+def _json_request(endpoint: str, data: Dict[str, Any],
+                  authorization_token: str) -> Tuple[bytes, Mapping[str, str]]:
+    """Serialized body and headers of a JSON request, built in one step before the first attempt"""
+    preparer = _REQUEST_PREPARERS.get(endpoint)
+    body = _json_dumps(preparer(data) if preparer else data)
+    return body, _build_headers(authorization_token, False)
+
 class KYCClient:
     """HTTP client for KYC API operations with high concurrency support"""
     
@@ -166,24 +358,18 @@ class KYCClient:
         self._closed = True
     
     def _prepare_headers(self, authorization_token: Optional[str] = None,
-                        is_multipart: bool = False) -> Dict[str, str]:
+                        is_multipart: bool = False) -> Mapping[str, str]:
         """Prepare headers for API request"""
-        if is_multipart:
-            headers = {}  # Let httpx set Content-Type for multipart
-        else:
-            headers = DEFAULT_HEADERS.copy()
-
-        if authorization_token:
-            if authorization_token.startswith('Bearer '):
-                headers["Authorization"] = authorization_token
-            else:
-                headers["Authorization"] = f"Bearer {authorization_token}"
-
-        return headers
+        return _build_headers(authorization_token, is_multipart)
     
     async def post_json(self, endpoint: str, data: Dict[str, Any],
-                       authorization_token: Optional[str] = None) -> KYCResponse:
-        """Make a POST request with JSON data using connection pool"""
+                       authorization_token: Optional[str] = None,
+                       bypass_cache: bool = False) -> KYCResponse:
+        """Make a POST request with JSON data using connection pool
+
+        Successful lookups on CACHEABLE_ENDPOINTS are reused for RESPONSE_CACHE_TTL seconds;
+        pass bypass_cache=True to force a fresh request, which also refreshes the cache.
+        """
         if self._closed:
             return KYCResponse(
                 success=False, 
@@ -204,89 +390,95 @@ class KYCClient:
             logger.error(error_msg)
             return KYCResponse(success=False, error=error_msg, status_code=401)
             
-        headers = self._prepare_headers(authorization_token)
+        # Prepare request data based on endpoint, serialized once for every attempt
+        body, headers = _json_request(endpoint, data, authorization_token)
         
-        # Prepare request data based on endpoint
-        request_data = self._prepare_request_data(endpoint, data)
+        cache_key = None
+        if endpoint in CACHEABLE_ENDPOINTS:
+            cache_key = (endpoint, authorization_token, body)
+            if not bypass_cache:
+                cached = _get_cached_response(cache_key)
+                if cached is not None:
+                    logger.debug("Serving %s from the response cache", endpoint)
+                    return cached
         
-        # Use connection pool for the request
-        async with self.connection_pool.get_client() as client:
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    logger.debug(f"Making request to {url} (attempt {attempt + 1}/{max_retries})")
-                    
-                    response = await client.post(url, json=request_data, headers=headers)
-                    
-                    if response.status_code == 200:
-                        return self._handle_response(response, endpoint)
-                    elif response.status_code == 401:
-                        error_msg = ("Authentication failed. Please check your API token and ensure it has "
-                                   "the required permissions for this operation.")
-                        return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
-                    elif response.status_code == 403:
-                        error_msg = ("Access forbidden. Your API token may not have permission to access "
-                                   "this endpoint.")
-                        return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
-                    elif response.status_code >= 500 and attempt < max_retries - 1:
-                        # Retry on server errors
-                        logger.warning(f"Server error {response.status_code}, retrying in {attempt + 1} seconds...")
-                        await asyncio.sleep(attempt + 1)
-                        continue
-                    else:
-                        error_msg = f"API error: Status {response.status_code}, Response: {response.text}"
-                        logger.error(error_msg)
-                        return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
-
-                except httpx.RequestError as e:
-                    error_msg = str(e)
-                    logger.error(f"HTTP request failed: {error_msg}")
-
-                    # Retry on network errors with exponential backoff
-                    if attempt < max_retries - 1:
-                        wait_time = min(2 ** attempt, 10)  # Exponential backoff, max 10 seconds
-                        logger.warning(f"Network error, retrying in {wait_time} seconds... ({attempt + 1}/{max_retries})")
-                        await asyncio.sleep(wait_time)
-                        continue
-
-                    # Provide descriptive error messages
-                    if "All connection attempts failed" in error_msg:
-                        error_msg = (
-                            "Network connection failed. This could be due to:\n"
-                            "1. Firewall blocking HTTPS connections to kyc-api.surepass.io\n"
-                            "2. Corporate network restrictions\n"
-                            "3. ISP blocking the connection\n"
-                            "4. The API server may be temporarily unavailable\n"
-                            f"Original error: {error_msg}"
-                        )
-                    elif "TimeoutError" in error_msg or "ConnectTimeout" in error_msg:
-                        error_msg = (
-                            "Connection timed out. The server took too long to respond.\n"
-                            "This might indicate network connectivity issues or server overload.\n"
-                            f"Original error: {error_msg}"
-                        )
-
-                    return KYCResponse(success=False, error=f"Network error after {max_retries} attempts: {error_msg}", status_code=None)
+        response = await self._send_json(url, endpoint, body, headers)
+        if cache_key is not None and response.success and response.status_code == 200:
+            _cache_response(cache_key, response)
+        return response
     
-    def _prepare_request_data(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare request data based on endpoint"""
-        if endpoint == ENDPOINTS["pan_comprehensive"]:
-            # Format specifically for PAN comprehensive v2 endpoint
-            return {
-                "id_number": data["id_number"],
-                "get_father_name": True,   # Get father's name if available
-                "get_address": True,       # Get complete address details
-                "get_gender": True,        # Get gender information
-                "get_minor_flag": True,    # Get minor status
-                "consent": "Y",            # Required for full data access
-                "get_pdf": True,           # Get PDF document if available
-                "get_extra_payload_text": True  # Get any additional information
-            }
-        elif endpoint == ENDPOINTS["pan"]:
-            # Basic PAN verification format
-            return {"id_number": data["id_number"]}
-        else:
-            return data
+    async def _send_json(self, url: str, endpoint: str, body: bytes,
+                         headers: Mapping[str, str]) -> KYCResponse:
+        """POST a prepared JSON body, retrying server and network errors"""
+        max_retries = MAX_ATTEMPTS
+        for attempt in range(max_retries):
+            # Fail fast, and stop retrying, while the API is known to be down
+            if not circuit_breaker.allow():
+                return _circuit_open_response()
+            try:
+                logger.debug("Making request to %s (attempt %d/%d)", url, attempt + 1, max_retries)
+                
+                # Hold a pool slot only for the request itself, never across a backoff sleep
+                async with self.connection_pool as client:
+                    response = await client.post(url, content=body, headers=headers)
+                circuit_breaker.record_response(response.status_code)
+                
+                if response.status_code == 200:
+                    return self._handle_response(response, endpoint)
+                elif response.status_code == 401:
+                    error_msg = ("Authentication failed. Please check your API token and ensure it has "
+                               "the required permissions for this operation.")
+                    return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
+                elif response.status_code == 403:
+                    error_msg = ("Access forbidden. Your API token may not have permission to access "
+                               "this endpoint.")
+                    return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
+                elif (response.status_code in RETRY_STATUS_CODES and attempt < max_retries - 1
+                        and not circuit_breaker.is_open):
+                    # Retry on gateway errors, unless this failure just opened the circuit
+                    wait_time = _retry_delay(attempt)
+                    logger.warning(f"Server error {response.status_code}, retrying in {wait_time:.2f} seconds...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    error_msg = f"API error: Status {response.status_code}, Response: {response.text}"
+                    logger.error(error_msg)
+                    return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
+
+            except httpx.RequestError as e:
+                circuit_breaker.record_failure()
+                error_msg = str(e)
+                logger.error(f"HTTP request failed: {error_msg}")
+
+                # Retry on transport errors with exponential backoff, unless this failure just opened the circuit
+                if (isinstance(e, httpx.TransportError) and attempt < max_retries - 1
+                        and not circuit_breaker.is_open):
+                    wait_time = _retry_delay(attempt)
+                    logger.warning(f"Network error, retrying in {wait_time:.2f} seconds... ({attempt + 1}/{max_retries})")
+                    await asyncio.sleep(wait_time)
+                    continue
+
+                # Provide descriptive error messages, classified by exception type
+                if isinstance(e, httpx.ConnectError):
+                    error_msg = (
+                        "Network connection failed. This could be due to:\n"
+                        "1. Firewall blocking HTTPS connections to kyc-api.surepass.io\n"
+                        "2. Corporate network restrictions\n"
+                        "3. ISP blocking the connection\n"
+                        "4. The API server may be temporarily unavailable\n"
+                        f"Original error: {error_msg}"
+                    )
+                elif isinstance(e, httpx.TimeoutException):
+                    error_msg = (
+                        "Connection timed out. The server took too long to respond.\n"
+                        "This might indicate network connectivity issues or server overload.\n"
+                        f"Original error: {error_msg}"
+                    )
+
+                return KYCResponse(success=False, error=f"Network error after {attempt + 1} attempts: {error_msg}", status_code=None)
+        
+        # Only reached when no attempt is made at all; never fall through to an implicit None
+        return KYCResponse(success=False, error=f"Request failed after {max_retries} attempts", status_code=None)
     
     async def post_form(self, endpoint: str, files: Dict[str, Any],
                        data: Optional[Dict[str, str]] = None,
@@ -315,104 +507,70 @@ class KYCClient:
         headers = self._prepare_headers(authorization_token, is_multipart=True)
         
         try:
-            # Prepare files for upload
-            prepared_files = {}
-            for key, file_path in files.items():
-                if isinstance(file_path, str):
+            # Prepare files for upload; the stack closes them even if a later file is missing or the request fails
+            with ExitStack() as open_files:
+                prepared_files = {}
+                for key, file_path in files.items():
+                    if isinstance(file_path, tuple):
+                        # Already an httpx file tuple, e.g. (filename, file object, content type) from an upload
+                        prepared_files[key] = file_path
+                        continue
                     file_path = Path(file_path)
-                if file_path.exists():
-                    prepared_files[key] = open(file_path, 'rb')
-                else:
-                    raise APIError(f"File not found: {file_path}")
-            
-            async with self.connection_pool.get_client() as client:
-                logger.info(f"Making form request to {url}")
-                response = await client.post(url, files=prepared_files, 
-                                           data=data or {}, headers=headers)
+                    if not file_path.exists():
+                        raise APIError(f"File not found: {file_path}")
+                    # httpx streams file objects into the multipart body in chunks
+                    prepared_files[key] = open_files.enter_context(open(file_path, 'rb'))
                 
-                # Close file handles
-                for file_handle in prepared_files.values():
-                    file_handle.close()
-                
-                if response.status_code != 200:
-                    error_msg = f"API error: Status {response.status_code}, Response: {response.text}"
-                    logger.error(error_msg)
-                    if response.status_code == 401:
-                        error_msg = ("Authentication failed. Please check your API token and ensure it has "
-                                   "the required permissions for this operation.")
-                    elif response.status_code == 403:
-                        error_msg = ("Access forbidden. Your API token may not have permission to access "
-                                   "this endpoint.")
-                    return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
+                if not circuit_breaker.allow():
+                    return _circuit_open_response()
                 
-                return self._handle_response(response, endpoint)
+                async with self.connection_pool as client:
+                    logger.info(f"Making form request to {url}")
+                    response = await client.post(url, files=prepared_files, 
+                                               data=data or {}, headers=headers)
+                circuit_breaker.record_response(response.status_code)
+            
+            if response.status_code != 200:
+                error_msg = f"API error: Status {response.status_code}, Response: {response.text}"
+                logger.error(error_msg)
+                if response.status_code == 401:
+                    error_msg = ("Authentication failed. Please check your API token and ensure it has "
+                               "the required permissions for this operation.")
+                elif response.status_code == 403:
+                    error_msg = ("Access forbidden. Your API token may not have permission to access "
+                               "this endpoint.")
+                return KYCResponse(success=False, error=error_msg, status_code=response.status_code)
+            
+            return self._handle_response(response, endpoint)
                 
         except httpx.RequestError as e:
+            circuit_breaker.record_failure()
             error_msg = str(e)
             logger.error(f"HTTP form request failed: {error_msg}")
             # Provide more descriptive error messages for common issues
-            if "ConnectionError" in error_msg:
+            if isinstance(e, httpx.ConnectError):
                 error_msg = ("Connection failed. Please check your internet connection and verify "
                            "the API base URL is correct.")
-            elif "TimeoutError" in error_msg:
-                error_msg = "Request timed out. The server took too long to respond."
-            elif "ConnectTimeout" in error_msg:
+            elif isinstance(e, httpx.ConnectTimeout):
                 error_msg = "Connection timed out. Could not establish connection to the server."
+            elif isinstance(e, httpx.TimeoutException):
+                error_msg = "Request timed out. The server took too long to respond."
             return KYCResponse(success=False, error=error_msg, status_code=None)
     
     def _handle_response(self, response: httpx.Response, endpoint: str) -> KYCResponse:
         """Handle HTTP response - optimized for performance"""
         try:
             if response.status_code == 200:
-                raw_data = response.json()
+                raw_data = _json_loads(response.content)
                 # Handle both success and error responses from the API
                 success = raw_data.get('success', True)  # Default to True for backward compatibility
                 status_code = raw_data.get('status_code', response.status_code)
                 message = raw_data.get('message')
                 message_code = raw_data.get('message_code')
                 
-                # Check response format and extract data
-                if 'data' in raw_data:
-                    data = raw_data['data']
-                else:
-                    # Some endpoints return data at root level
-                    data = raw_data
-                    # For basic PAN endpoint, make sure we have standard fields
-                    if endpoint == ENDPOINTS["pan"]:
-                        data.setdefault('success', success)
-                        data.setdefault('status_code', status_code)
-                        data.setdefault('message', message or 'Verification completed')
-
-                # Handle PAN comprehensive endpoint address structure
-                if isinstance(data, dict) and endpoint == ENDPOINTS["pan_comprehensive"]:
-                    # Initialize address data with None values
-                    address_data = {
-                        'line_1': None, 'line_2': None, 'street_name': None,
-                        'zip': None, 'city': None, 'state': None, 
-                        'country': None, 'full': None
-                    }
-
-                    # Extract address from response if available
-                    if 'address' in data and isinstance(data['address'], dict):
-                        address_response = data['address']
-                        for field in address_data.keys():
-                            if field in address_response and address_response[field] is not None:
-                                if isinstance(address_response[field], (str, int)):
-                                    address_data[field] = str(address_response[field]).strip()
-                    
-                    # Always set address data in response
-                    data['address'] = address_data
-                    
-                    # Ensure all required fields are present with defaults
-                    defaults = {
-                        'client_id': None, 'pan_number': None, 'full_name': None,
-                        'full_name_split': [], 'masked_aadhaar': None, 'email': None,
-                        'phone_number': None, 'gender': None, 'dob': None,
-                        'input_dob': None, 'aadhaar_linked': False, 'dob_verified': False,
-                        'dob_check': False, 'category': None, 'less_info': False
-                    }
-                    for key, default_value in defaults.items():
-                        data.setdefault(key, default_value)
+                # Extract data, normalized per endpoint
+                handler = _RESPONSE_HANDLERS.get(endpoint, _response_data)
+                data = handler(raw_data, response.status_code)
                 
                 return KYCResponse(
                     success=success,
@@ -422,16 +580,16 @@ class KYCClient:
                     message_code=message_code
                 )
             else:
-                error_data = response.text
                 try:
-                    error_json = response.json()
-                    # Try multiple possible error message locations
+                    error_json = _json_loads(response.content)
+                    # Try multiple possible error message locations; the body is decoded as text only as a last resort
+                    error_details = error_json.get('data') or _EMPTY_MAPPING
                     error_message = (
                         error_json.get('message') or 
                         error_json.get('error') or 
-                        (error_json.get('data', {}) or {}).get('message') or
-                        (error_json.get('data', {}) or {}).get('error') or
-                        error_data
+                        error_details.get('message') or
+                        error_details.get('error') or
+                        response.text
                     )
                     
                     # Return full error response in data field for debugging
@@ -442,7 +600,7 @@ class KYCClient:
                         data=error_json  # Include full error response for debugging
                     )
                 except:
-                    error_message = error_data
+                    error_message = response.text
                     return KYCResponse(
                         success=False,
                         error=f"API Error: {error_message}",
@@ -455,26 +613,19 @@ class KYCClient:
                 status_code=response.status_code
             )
     
+    def get_health(self) -> Dict[str, Any]:
+        """Circuit breaker state and connection usage, for health endpoints"""
+        return {
+            'circuit_state': circuit_breaker.state,
+            'circuit_failure_count': circuit_breaker.failure_count,
+            'requests_in_flight': self.connection_pool.in_flight,
+            'cached_responses': len(_response_cache),
+        }
+    
     async def close(self):
         """Close the HTTP client"""
         self._closed = True
 
-# Client factory for managing client lifecycle
-class KYCClientFactory:
-    """Factory for creating and managing KYC client instances"""
-    
-    def __init__(self):
-        self.connection_pool = get_connection_pool()
-    
-    async def create_client(self) -> KYCClient:
-        """Create a new KYC client instance"""
-        client = KYCClient()
-        await client.__aenter__()
-        return client
-    
-    async def cleanup(self):
-        """Cleanup all factory resources"""
-        await self.connection_pool.close_all()
-
-# Global factory instance
-client_factory = KYCClientFactory()
\ No newline at end of file
+async def close_connection_pool():
+    """Close the shared HTTP client; call once at process shutdown"""
+    await get_connection_pool().close_all()
\ No newline at end of file
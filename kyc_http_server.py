@@ -27,7 +27,7 @@ except Exception as e:
     print(f"Could not load .env file: {e}")
 
 # Import MCP components
-from kyc_client import KYCClient
+from kyc_client import KYCClient, close_connection_pool
 from config import ENDPOINTS, SUREPASS_API_TOKEN
 from database import db_manager
 from config_db import DATABASE_ENABLED
@@ -235,6 +235,9 @@ async def shutdown_event():
             await kyc_client.__aexit__(None, None, None)
             await kyc_client.close()
             logger.info("KYC client closed")
+        
+        # Close the shared HTTP client while the event loop that owns its connections is still running
+        await close_connection_pool()
 
         if DATABASE_ENABLED:
             try:
@@ -265,6 +268,7 @@ async def health_check():
         "version": "2.1.0",
         "api_token_configured": bool(SUREPASS_API_TOKEN),
         "client_initialized": kyc_client is not None,
+        "kyc_api": kyc_client.get_health() if kyc_client else None,
         "database_enabled": DATABASE_ENABLED,
         "google_drive_available": GOOGLE_DRIVE_AVAILABLE,
         "google_drive_initialized": google_drive_storage.initialized if google_drive_storage else False,
@@ -32,9 +32,10 @@ except ImportError:
 except Exception as e:
     print(f"Could not load .env file: {e}", file=sys.stderr)
 
+import anyio
 from mcp.server.fastmcp import FastMCP
 
-from kyc_client import KYCClient
+from kyc_client import KYCClient, close_connection_pool
 from config import ENDPOINTS
 from database import db_manager
 from config_db import DATABASE_ENABLED
@@ -76,8 +77,47 @@ class ClientManager:
 
 client_manager = ClientManager()
 
+# Clean up clients and databases on the server's own event loop, where they were created
+async def cleanup_resources():
+    """Close active KYC clients, the shared HTTP client and the database managers"""
+    # Close all active KYC clients
+    if client_manager.active_clients:
+        for client in list(client_manager.active_clients):
+            try:
+                await client.__aexit__(None, None, None)
+                await client.close()
+            except Exception as e:
+                logger.error("Error closing KYC client: %s", str(e))
+        client_manager.active_clients.clear()
+        logger.info("All KYC clients closed successfully")
+    
+    # Close the shared HTTP client so its connections are not left for garbage collection
+    try:
+        await close_connection_pool()
+    except Exception as e:
+        logger.error("Error closing shared HTTP client: %s", str(e))
+    
+    # Close database; each manager is closed even if the other fails, so both flush their log rows
+    if DATABASE_ENABLED:
+        for manager in (db_manager, universal_db_manager):
+            try:
+                await manager.close()
+            except Exception as e:
+                logger.error("Error closing database: %s", str(e))
+        logger.info("Database connections closed")
+
+@asynccontextmanager
+async def server_lifespan(_server):
+    """Run cleanup_resources when the server stops, including on SIGINT/SIGTERM"""
+    try:
+        yield
+    finally:
+        # Shielded, so shutdown cancellation does not interrupt the final flushes
+        with anyio.CancelScope(shield=True):
+            await cleanup_resources()
+
 # Create the FastMCP server
-mcp = FastMCP("kyc-verification-server")
+mcp = FastMCP("kyc-verification-server", lifespan=server_lifespan)
 
 # Initialize database on server startup
 async def ensure_client_initialized():
@@ -268,54 +308,8 @@ async def debug_environment() -> str:
 
 mcp.startup_handler = ensure_client_initialized
 
-# Clean up client and database on exit
-def cleanup_handler(signum, _frame):
-    """Signal handler for cleanup"""
-    logger.info("Received signal %s, cleaning up...", signum)
-    import asyncio
-
-    def run_cleanup():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        async def cleanup():
-            # Close all active KYC clients
-            if hasattr(client_manager, "active_clients") and client_manager.active_clients:
-                for client in list(client_manager.active_clients):
-                    try:
-                        await client.__aexit__(None, None, None)
-                        await client.close()
-                    except Exception as e:
-                        logger.error("Error closing KYC client: %s", str(e))
-                client_manager.active_clients.clear()
-                logger.info("All KYC clients closed successfully")
-
-            # Close database
-            if DATABASE_ENABLED:
-                try:
-                    await db_manager.close()
-                    await universal_db_manager.close()
-                    logger.info("Database connections closed successfully")
-                except Exception as e:
-                    logger.error("Error closing database: %s", str(e))
-
-        try:
-            loop.run_until_complete(cleanup())
-        except Exception as e:
-            logger.error("Error during cleanup: %s", str(e))
-        finally:
-            loop.close()
-
-    try:
-        run_cleanup()
-    except Exception as e:
-        logger.error("Error during cleanup: %s", str(e))
-
-    sys.exit(0)
-
-# Register cleanup handler for signals
-signal.signal(signal.SIGINT, cleanup_handler)
-signal.signal(signal.SIGTERM, cleanup_handler)
+# Treat SIGTERM as Ctrl+C: the event loop cancels the server, and server_lifespan cleans up on that loop
+signal.signal(signal.SIGTERM, lambda _signum, _frame: signal.raise_signal(signal.SIGINT))
 
 logger.info("KYC MCP Server initialized and ready")
 
@@ -2434,4 +2428,7 @@ async def get_server_health() -> str:
 
 
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    try:
+        mcp.run()
+    except KeyboardInterrupt:
+        logger.info("KYC MCP Server stopped")
\ No newline at end of file
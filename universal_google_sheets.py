@@ -2,16 +2,54 @@
 
 import json
 import logging
-from datetime import datetime
 from typing import Optional, Dict, Any, List
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-from google_sheets_database import GoogleSheetsKYCDatabase
+from google_sheets_database import GoogleSheetsKYCDatabase, _appended_row_number, _cell_text, _json_dumps, _json_loads, _utc_timestamp
 from config_db import DATABASE_ENABLED
 
 logger = logging.getLogger("kyc-universal-google-sheets")
 
+# Universal_Records column holding the document number for each verification type
+_DOC_NUMBER_COLUMNS = {
+    'aadhaar': 'Aadhaar_Number',
+    'voter_id': 'Voter_ID',
+    'driving_license': 'Driving_License',
+    'passport': 'Passport_Number',
+    'gstin': 'GSTIN',
+    'tan': 'TAN_Number',
+    'bank_verification': 'Bank_Account'
+}
+
+# Document number columns in Universal_Records order
+_DOC_NUMBER_FIELDS = ('PAN_Number',) + tuple(_DOC_NUMBER_COLUMNS.values())
+
+def _doc_number_column(verification_type: str) -> Optional[str]:
+    """Resolve the document number column for a verification type"""
+    if verification_type.startswith('pan'):
+        return 'PAN_Number'
+    return _DOC_NUMBER_COLUMNS.get(verification_type)
+
+def _universal_record_matcher(search_type: str, search_value: str):
+    """Build the per-record predicate for a search type, or None if unsupported"""
+    if search_type == 'pan':
+        pan_number = search_value.upper()
+        return lambda record: record.get('PAN_Number') == pan_number
+    elif search_type == 'name':
+        search_name = search_value.lower()
+        return lambda record: (
+            search_name in record.get('Full_Name', '').lower() or
+            search_name in record.get('First_Name', '').lower() or
+            search_name in record.get('Last_Name', '').lower()
+        )
+    elif search_type == 'phone':
+        return lambda record: record.get('Phone_Number') == search_value
+    elif search_type == 'email':
+        search_email = search_value.lower()
+        return lambda record: search_email in record.get('Email', '').lower()
+    return None
+
 class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
     """Universal Google Sheets database manager for all KYC verification types"""
     
@@ -27,10 +65,7 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
             # Extract document number based on verification type
             doc_number = verification_data.get('id_number') or verification_data.get('pan_number')
             
-            worksheet = await self._run_sync(
-                self.spreadsheet.worksheet, 
-                self.worksheets['universal_records']
-            )
+            worksheet = await self._get_worksheet('universal_records')
             
             # Find existing record
             existing_record = await self._find_universal_record(worksheet, verification_type, doc_number)
@@ -47,12 +82,20 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
                     f"A{existing_record['row_num']}",
                     [record_data]
                 )
-                logger.info(f"Updated existing {verification_type} record for {doc_number}")
+                self._invalidate_records('universal_records')
+                logger.info("Updated existing %s record for %s", verification_type, doc_number)
                 record_id = existing_record['id']
             else:
                 # Add new record
-                await self._run_sync(worksheet.append_row, record_data)
-                logger.info(f"Created new {verification_type} record for {doc_number}")
+                def append_row():
+                    return worksheet.append_row(record_data, insert_data_option='INSERT_ROWS', table_range='A1')
+                
+                response = await self._run_sync(append_row, idempotent=False)
+                self._invalidate_records('universal_records')
+                column = _doc_number_column(verification_type)
+                if doc_number and column:
+                    self._remember_row('universal_records', column, doc_number, _appended_row_number(response))
+                logger.info("Created new %s record for %s", verification_type, doc_number)
                 record_id = record_data[0]  # ID is first column
             
             return {'id': record_id, 'verification_type': verification_type}
@@ -63,32 +106,16 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
     
     async def _find_universal_record(self, worksheet, verification_type: str, doc_number: str) -> Optional[Dict[str, Any]]:
         """Find existing universal record"""
-        if not doc_number:
+        column = _doc_number_column(verification_type)
+        if not doc_number or not column:
             return None
             
         try:
-            records = await self._run_sync(worksheet.get_all_records)
-            
-            for i, record in enumerate(records, start=2):  # Start from row 2
-                # Check based on verification type
-                if verification_type.startswith('pan') and record.get('PAN_Number') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
-                elif verification_type == 'aadhaar' and record.get('Aadhaar_Number') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
-                elif verification_type == 'voter_id' and record.get('Voter_ID') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
-                elif verification_type == 'driving_license' and record.get('Driving_License') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
-                elif verification_type == 'passport' and record.get('Passport_Number') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
-                elif verification_type == 'gstin' and record.get('GSTIN') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
-                elif verification_type == 'tan' and record.get('TAN_Number') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
-                elif verification_type == 'bank_verification' and record.get('Bank_Account') == doc_number:
-                    return {'row_num': i, 'id': record.get('ID'), 'record': record}
+            match = await self._find_record_by_column(worksheet, 'universal_records', column, doc_number)
+            if not match:
+                return None
             
-            return None
+            return {'row_num': match['row_num'], 'id': match['record'].get('ID'), 'record': match['record']}
             
         except Exception as e:
             logger.error(f"Error finding universal record: {str(e)}")
@@ -97,7 +124,7 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
     async def _prepare_universal_record_data(self, data: Dict[str, Any], verification_type: str, existing_record: Optional[Dict[str, Any]]) -> List[str]:
         """Prepare universal record data for Google Sheets"""
         try:
-            timestamp = datetime.utcnow().isoformat()
+            timestamp = _utc_timestamp()
             
             # Get existing data if updating
             if existing_record:
@@ -110,7 +137,7 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
                 existing_history = []
                 if existing_data.get('Verification_History'):
                     try:
-                        existing_history = json.loads(existing_data['Verification_History'])
+                        existing_history = _json_loads(existing_data['Verification_History'])
                     except json.JSONDecodeError:
                         existing_history = []
                 
@@ -118,7 +145,7 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
                 existing_responses = {}
                 if existing_data.get('Raw_Responses'):
                     try:
-                        existing_responses = json.loads(existing_data['Raw_Responses'])
+                        existing_responses = _json_loads(existing_data['Raw_Responses'])
                     except json.JSONDecodeError:
                         existing_responses = {}
             else:
@@ -129,6 +156,10 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
                 existing_responses = {}
                 existing_data = {}
             
+            # Bind lookups once; the row below performs ~60 of them
+            get = data.get
+            get_existing = existing_data.get
+            
             # Update verification history
             existing_history.append({
                 'type': verification_type,
@@ -139,62 +170,59 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
             # Update raw responses
             existing_responses[verification_type] = data
             
-            # Prepare document numbers
-            pan_number = data.get('id_number') if verification_type.startswith('pan') else existing_data.get('PAN_Number', '')
-            aadhaar_number = data.get('id_number') if verification_type == 'aadhaar' else existing_data.get('Aadhaar_Number', '')
-            voter_id = data.get('id_number') if verification_type == 'voter_id' else existing_data.get('Voter_ID', '')
-            driving_license = data.get('id_number') if verification_type == 'driving_license' else existing_data.get('Driving_License', '')
-            passport_number = data.get('id_number') if verification_type == 'passport' else existing_data.get('Passport_Number', '')
-            gstin = data.get('id_number') if verification_type == 'gstin' else existing_data.get('GSTIN', '')
-            tan_number = data.get('id_number') if verification_type == 'tan' else existing_data.get('TAN_Number', '')
-            bank_account = data.get('id_number') if verification_type == 'bank_verification' else existing_data.get('Bank_Account', '')
+            # Prepare document numbers: the verified type gets the new ID, others keep existing values
+            target_column = _doc_number_column(verification_type)
+            doc_numbers = {
+                column: get('id_number') if column == target_column else get_existing(column, '')
+                for column in _DOC_NUMBER_FIELDS
+            }
             
             # Prepare address data
-            address_data = data.get('address') or existing_data.get('Address_Data')
-            address_json = json.dumps(address_data) if address_data else ""
+            address_data = get('address') or get_existing('Address_Data')
+            address_json = _json_dumps(address_data) if address_data else ""
             
             # Prepare other data fields
-            verification_history_json = json.dumps(existing_history)
-            raw_responses_json = json.dumps(existing_responses)
-            extra_data_json = json.dumps(data.get('extra_data', {}))
+            verification_history_json = _json_dumps(existing_history)
+            raw_responses_json = _json_dumps(existing_responses)
+            extra_data_json = _json_dumps(get('extra_data', {}))
             
             # Build complete row data
             row_data = [
                 record_id,                                                    # ID
-                pan_number or data.get('pan_number', ''),                    # PAN_Number
-                aadhaar_number or data.get('aadhaar_number', ''),            # Aadhaar_Number
-                voter_id,                                                     # Voter_ID
-                driving_license,                                              # Driving_License
-                passport_number,                                              # Passport_Number
-                gstin,                                                        # GSTIN
-                tan_number,                                                   # TAN_Number
-                bank_account,                                                 # Bank_Account
-                data.get('full_name') or existing_data.get('Full_Name', ''), # Full_Name
-                data.get('first_name') or existing_data.get('First_Name', ''), # First_Name
-                data.get('middle_name') or existing_data.get('Middle_Name', ''), # Middle_Name
-                data.get('last_name') or existing_data.get('Last_Name', ''), # Last_Name
-                data.get('father_name') or existing_data.get('Father_Name', ''), # Father_Name
-                data.get('gender') or existing_data.get('Gender', ''),       # Gender
-                data.get('dob') or existing_data.get('DOB', ''),             # DOB
-                data.get('category') or existing_data.get('Category', ''),   # Category
-                data.get('is_minor') or existing_data.get('Is_Minor', ''),   # Is_Minor
-                data.get('phone_number') or data.get('mobile') or existing_data.get('Phone_Number', ''), # Phone_Number
-                data.get('email') or existing_data.get('Email', ''),         # Email
+                doc_numbers['PAN_Number'] or get('pan_number', ''),           # PAN_Number
+                doc_numbers['Aadhaar_Number'] or get('aadhaar_number', ''),   # Aadhaar_Number
+                doc_numbers['Voter_ID'],                                      # Voter_ID
+                doc_numbers['Driving_License'],                               # Driving_License
+                doc_numbers['Passport_Number'],                               # Passport_Number
+                doc_numbers['GSTIN'],                                         # GSTIN
+                doc_numbers['TAN_Number'],                                    # TAN_Number
+                doc_numbers['Bank_Account'],                                  # Bank_Account
+                get('full_name') or get_existing('Full_Name', ''),            # Full_Name
+                get('first_name') or get_existing('First_Name', ''),          # First_Name
+                get('middle_name') or get_existing('Middle_Name', ''),        # Middle_Name
+                get('last_name') or get_existing('Last_Name', ''),            # Last_Name
+                get('father_name') or get_existing('Father_Name', ''),        # Father_Name
+                get('gender') or get_existing('Gender', ''),                  # Gender
+                get('dob') or get_existing('DOB', ''),                        # DOB
+                get('category') or get_existing('Category', ''),              # Category
+                get('is_minor') or get_existing('Is_Minor', ''),              # Is_Minor
+                get('phone_number') or get('mobile') or get_existing('Phone_Number', ''), # Phone_Number
+                get('email') or get_existing('Email', ''),                    # Email
                 address_json,                                                 # Address_Data
-                data.get('company_name') or existing_data.get('Company_Name', ''), # Company_Name
-                data.get('business_type') or existing_data.get('Business_Type', ''), # Business_Type
-                data.get('incorporation_date') or existing_data.get('Incorporation_Date', ''), # Incorporation_Date
-                data.get('ifsc_code') or data.get('ifsc') or existing_data.get('IFSC_Code', ''), # IFSC_Code
-                data.get('bank_name') or existing_data.get('Bank_Name', ''), # Bank_Name
-                data.get('branch_name') or existing_data.get('Branch_Name', ''), # Branch_Name
-                data.get('upi_id') or existing_data.get('UPI_ID', ''),       # UPI_ID
-                data.get('aadhaar_linked') or existing_data.get('Aadhaar_Linked', ''), # Aadhaar_Linked
-                data.get('dob_verified') or existing_data.get('DOB_Verified', ''), # DOB_Verified
+                get('company_name') or get_existing('Company_Name', ''),      # Company_Name
+                get('business_type') or get_existing('Business_Type', ''),    # Business_Type
+                get('incorporation_date') or get_existing('Incorporation_Date', ''), # Incorporation_Date
+                get('ifsc_code') or get('ifsc') or get_existing('IFSC_Code', ''), # IFSC_Code
+                get('bank_name') or get_existing('Bank_Name', ''),            # Bank_Name
+                get('branch_name') or get_existing('Branch_Name', ''),        # Branch_Name
+                get('upi_id') or get_existing('UPI_ID', ''),                  # UPI_ID
+                get('aadhaar_linked') or get_existing('Aadhaar_Linked', ''),  # Aadhaar_Linked
+                get('dob_verified') or get_existing('DOB_Verified', ''),      # DOB_Verified
                 'verified',                                                   # Verification_Status
                 verification_type,                                            # Last_Verification_Type
                 verification_type,                                            # Verification_Source
                 verification_count,                                           # Verification_Count
-                data.get('confidence_score', ''),                           # Confidence_Score
+                get('confidence_score', ''),                                  # Confidence_Score
                 verification_history_json,                                    # Verification_History
                 raw_responses_json,                                           # Raw_Responses
                 extra_data_json,                                              # Extra_Data
@@ -204,7 +232,7 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
             ]
             
             # Convert all values to strings for Google Sheets
-            return [str(value) if value is not None else '' for value in row_data]
+            return [_cell_text(value) for value in row_data]
             
         except Exception as e:
             logger.error(f"Error preparing universal record data: {str(e)}")
@@ -216,35 +244,16 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
             return []
             
         try:
-            worksheet = await self._run_sync(
-                self.spreadsheet.worksheet, 
-                self.worksheets['universal_records']
-            )
-            
-            records = await self._run_sync(worksheet.get_all_records)
+            # Resolve the search type once instead of re-dispatching on every row
+            matcher = _universal_record_matcher(search_type, search_value)
             matches = []
             
-            for record in records:
-                if search_type == 'pan':
-                    if record.get('PAN_Number') == search_value.upper():
-                        matches.append(self._convert_universal_record_to_dict(record))
-                elif search_type == 'name':
-                    full_name = record.get('Full_Name', '').lower()
-                    first_name = record.get('First_Name', '').lower()
-                    last_name = record.get('Last_Name', '').lower()
-                    search_name = search_value.lower()
-                    
-                    if (search_name in full_name or 
-                        search_name in first_name or 
-                        search_name in last_name):
-                        matches.append(self._convert_universal_record_to_dict(record))
-                elif search_type == 'phone':
-                    if record.get('Phone_Number') == search_value:
-                        matches.append(self._convert_universal_record_to_dict(record))
-                elif search_type == 'email':
-                    record_email = record.get('Email', '').lower()
-                    if search_value.lower() in record_email:
-                        matches.append(self._convert_universal_record_to_dict(record))
+            if matcher:
+                records = await self._get_records('universal_records')
+                matches = [
+                    self._convert_universal_record_to_dict(record)
+                    for record in records if matcher(record)
+                ]
             
             await self._log_search(search_type, search_value, len(matches))
             return matches
@@ -263,12 +272,7 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
             return None
             
         try:
-            worksheet = await self._run_sync(
-                self.spreadsheet.worksheet, 
-                self.worksheets['universal_records']
-            )
-            
-            records = await self._run_sync(worksheet.get_all_records)
+            records = await self._get_records('universal_records')
             
             for record in records:
                 if record.get('ID') == str(person_id):
@@ -278,14 +282,14 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
                     verification_history = []
                     if record.get('Verification_History'):
                         try:
-                            verification_history = json.loads(record['Verification_History'])
+                            verification_history = _json_loads(record['Verification_History'])
                         except json.JSONDecodeError:
                             verification_history = []
                     
                     raw_responses = {}
                     if record.get('Raw_Responses'):
                         try:
-                            raw_responses = json.loads(record['Raw_Responses'])
+                            raw_responses = _json_loads(record['Raw_Responses'])
                         except json.JSONDecodeError:
                             raw_responses = {}
                     
@@ -310,28 +314,28 @@ class UniversalGoogleSheetsDatabase(GoogleSheetsKYCDatabase):
             address_data = None
             if record.get('Address_Data'):
                 try:
-                    address_data = json.loads(record['Address_Data'])
+                    address_data = _json_loads(record['Address_Data'])
                 except json.JSONDecodeError:
                     address_data = record['Address_Data']
             
             verification_history = []
             if record.get('Verification_History'):
                 try:
-                    verification_history = json.loads(record['Verification_History'])
+                    verification_history = _json_loads(record['Verification_History'])
                 except json.JSONDecodeError:
                     verification_history = []
             
             raw_responses = {}
             if record.get('Raw_Responses'):
                 try:
-                    raw_responses = json.loads(record['Raw_Responses'])
+                    raw_responses = _json_loads(record['Raw_Responses'])
                 except json.JSONDecodeError:
                     raw_responses = {}
             
             extra_data = {}
             if record.get('Extra_Data'):
                 try:
-                    extra_data = json.loads(record['Extra_Data'])
+                    extra_data = _json_loads(record['Extra_Data'])
                 except json.JSONDecodeError:
                     extra_data = {}
             